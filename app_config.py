@@ -1,9 +1,36 @@
 import json
 import os
 import sys
+import threading
+import time
+from copy import deepcopy
+from types import MappingProxyType
 
-# Default configuration
-DEFAULT_CONFIG = {
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _freeze(value):
+    """Read-only deep view of a default: dicts become mappingproxies, lists tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value):
+    """Mutable deep copy of a frozen default (the inverse of _freeze)."""
+    if isinstance(value, MappingProxyType):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+# Default configuration (read-only at every level; thawed into a copy before use)
+DEFAULT_CONFIG = _freeze({
     "models": {
         "PP-OCRv5": {
             "url": "",
@@ -70,13 +97,62 @@ DEFAULT_CONFIG = {
     },
     "hotkey_cature": "F4",
     "hotkey_trans_capture": "F6",
+    "hotkey_show_main": "F9",
     "save_dir": "output",
     "language": "zh_CN",
     "screenshot_model": "PP-OCRv5",
+    "upload_format": "JPEG",
+    "upload_quality": 85,
+    "upload_max_side": 0,
+    "batch_request_interval": 0.5,
     "minimize_to_tray": True,
     "hotkey_batch": "Ctrl+F4",
     "export_format": ["md", "txt"]
-}
+})
+
+# Delay (seconds) used to coalesce rapid set() calls into a single write
+SAVE_DELAY = 0.25
+
+# Delay (seconds) before retrying a config write that failed
+SAVE_RETRY_DELAY = 5.0
+
+
+# Settings mirrored by ConfigView, read on hot paths:
+# (attribute, config key, fall back to the default on empty values);
+# defaults come from DEFAULT_CONFIG
+VIEW_FIELDS = tuple(
+    (attr, key, DEFAULT_CONFIG[key], or_default)
+    for attr, key, or_default in (
+        ("screenshot_model", "screenshot_model", False),
+        ("hotkey_capture", "hotkey_cature", True),
+        ("hotkey_translate", "hotkey_trans_capture", True),
+        ("hotkey_show_main", "hotkey_show_main", True),
+        ("minimize_to_tray", "minimize_to_tray", False),
+        ("language", "language", False),
+    )
+)
+
+# Config keys mirrored by ConfigView
+VIEW_KEYS = frozenset(key for _, key, _, _ in VIEW_FIELDS)
+
+
+class ConfigView:
+    """Snapshot of frequently read settings exposed as plain attributes.
+
+    Refreshed by ConfigManager.set() whenever one of VIEW_KEYS changes.
+    """
+    __slots__ = tuple(attr for attr, _, _, _ in VIEW_FIELDS)
+
+    def __init__(self, data):
+        self.refresh(data)
+
+    def refresh(self, data):
+        get = data.get
+        for attr, key, default, or_default in VIEW_FIELDS:
+            value = get(key, default)
+            if or_default and not value:
+                value = default
+            setattr(self, attr, value)
 
 
 class ConfigManager:
@@ -91,45 +167,141 @@ class ConfigManager:
         
         self.config_path = os.path.join(self.base_path, "config.json")
         self.data = {}
+        self._model_cache = {}  # model name -> resolved model config
+        self._dirty = False
+        self._version = 0  # Bumped on every change; tells a finished write if it is stale
+        self._save_lock = threading.RLock()
+        self._save_cond = threading.Condition(self._save_lock)
+        self._write_lock = threading.Lock()  # Serializes writes to config.json
+        self._save_deadline = None  # monotonic time the background writer flushes at
+        self._save_thread = None
         self._load()
+        self.view = ConfigView(self.data)
 
     def _load(self):
-        # Check if config file exists
-        if os.path.exists(self.config_path):
-            try:
-                with open(self.config_path, "r", encoding="utf-8") as f:
-                    self.data = json.load(f)
-            except Exception as e:
-                print(f"Error loading config: {e}")
-                self.data = DEFAULT_CONFIG.copy()
-                self._save()
-        else:
-            # First launch: create default config
-            self.data = DEFAULT_CONFIG.copy()
-            self._save()
+        # Single read + single parse pass; no separate exists() stat
+        try:
+            with open(self.config_path, "rb") as f:
+                raw = f.read()
+            self.data = orjson.loads(raw) if orjson else json.loads(raw)
+            return
+        except FileNotFoundError:
+            pass  # First launch: create default config
+        except Exception as e:
+            print(f"Error loading config: {e}")
+        self.data = _thaw(DEFAULT_CONFIG)
+        self._save()
 
-    def _save(self):
+    def _save(self, data=None):
+        """Write data (default: the live config) to disk; returns True on success."""
+        if data is None:
+            data = self.data
         try:
-            with open(self.config_path, "w", encoding="utf-8") as f:
-                json.dump(self.data, f, ensure_ascii=False, indent=4)
+            if orjson:
+                blob = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            else:
+                blob = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+            # Write to a temp file and swap it in, so a crash mid-write
+            # never leaves a truncated config.json behind
+            tmp_path = self.config_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(blob)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.config_path)
+            return True
         except Exception as e:
             print(f"Error saving config: {e}")
+            return False
+
+    def _arm_save(self, delay):
+        """(Re)arm the background writer to flush after delay seconds. Caller holds _save_lock."""
+        self._save_deadline = time.monotonic() + delay
+        if self._save_thread is None:
+            self._save_thread = threading.Thread(target=self._save_loop, name="config-save", daemon=True)
+            self._save_thread.start()
+        else:
+            self._save_cond.notify()
+
+    def _schedule_save(self):
+        """Mark config dirty and (re)start the debounce delay."""
+        with self._save_lock:
+            self._dirty = True
+            self._version += 1
+            self._arm_save(SAVE_DELAY)
+
+    def _save_loop(self):
+        """Single long-lived writer thread: waits out the debounce delay, then flushes."""
+        while True:
+            with self._save_cond:
+                while True:
+                    if self._save_deadline is None:
+                        self._save_cond.wait()
+                        continue
+                    remaining = self._save_deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._save_cond.wait(remaining)
+            self.flush()
+
+    def flush(self):
+        """Write pending changes to disk immediately (call before exit).
+
+        Returns False if the write failed; the changes then stay pending and
+        the write is retried after SAVE_RETRY_DELAY.
+        """
+        with self._write_lock:
+            with self._save_lock:
+                self._save_deadline = None
+                if not self._dirty:
+                    return True
+                version = self._version
+                # Serialize a private copy: GUI code may keep changing
+                # nested values while the file is being written
+                snapshot = deepcopy(self.data)
+            if not self._save(snapshot):
+                with self._save_lock:
+                    if self._save_deadline is None:
+                        self._arm_save(SAVE_RETRY_DELAY)
+                return False
+            with self._save_lock:
+                # Changes made during the write keep the config dirty
+                if self._version == version:
+                    self._dirty = False
+            return True
 
     def get(self, key, default=None):
         return self.data.get(key, default)
 
     def set(self, key, value):
-        self.data[key] = value
-        self._save()
+        # Nothing to persist if the value is unchanged
+        if key in self.data and self.data[key] == value:
+            return
+        with self._save_lock:
+            self.data[key] = value
+            if key == "models":
+                self._model_cache.clear()
+            elif key in VIEW_KEYS:
+                self.view.refresh(self.data)
+            self._schedule_save()
 
     def get_model_config(self, model_name):
-        return self.data.get("models", {}).get(model_name, {})
+        cached = self._model_cache.get(model_name)
+        if cached is None:
+            cached = self.data.get("models", {}).get(model_name, {})
+            self._model_cache[model_name] = cached
+        return cached
 
     def set_model_config(self, model_name, url, token):
-        if "models" not in self.data:
-            self.data["models"] = {}
-        self.data["models"][model_name] = {"url": url, "token": token}
-        self._save()
+        model_config = {"url": url, "token": token}
+        if self.data.get("models", {}).get(model_name) == model_config:
+            return
+        with self._save_lock:
+            if "models" not in self.data:
+                self.data["models"] = {}
+            self.data["models"][model_name] = model_config
+            self._model_cache.pop(model_name, None)
+            self._schedule_save()
 
     def get_batch_config(self, mode):
         return self.data.get("batch", {}).get(mode, {})
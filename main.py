@@ -1,22 +1,56 @@
-import sys
 import os
-import keyboard
-from PySide6.QtWidgets import QApplication, QWidget, QMessageBox, QMenu, QSystemTrayIcon
-from PySide6.QtCore import QTimer, QByteArray, QBuffer, QIODevice, Signal, QObject
+import sys
+import time
+from PySide6.QtWidgets import QApplication, QWidget, QMenu, QSystemTrayIcon
+from PySide6.QtCore import Qt, QTimer, QByteArray, QBuffer, QIODevice, Signal, QObject
 from PySide6.QtGui import QIcon, QAction
 from ui.main_window import MainWindow
 from ui.snipping_tool import SnippingTool
-from ui.result_window import ResultWindow
 from ui.progress_overlay import ProgressOverlay
-from services.ocr_engine import ocr_client
 from app_config import config
-import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Long-lived pool for screenshot OCR and translation requests
+# (avoids a new thread per capture; lets translation chunks run concurrently)
+_ocr_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ocr")
+
+# How long (seconds) quitting waits for in-flight OCR/translation requests
+# before the process exits regardless
+SHUTDOWN_GRACE_SECONDS = 2.0
+
+# HTTP statuses meaning the API rejected the uploaded image itself (bad
+# request, too large, unsupported type); only these are worth a PNG retry
+PAYLOAD_REJECTED_STATUS = frozenset((400, 413, 415))
+
 
+class OCRResultHolder(QObject):
+    """Delivers OCR results from the worker thread to the GUI thread."""
+    finished = Signal(dict)
 
-class OCRResultHolder:
-    def __init__(self):
-        self.result = None
-        self.ready = False
+
+class TranslationResultHolder(QObject):
+    """Delivers translated chunks (generation, index, text) to the GUI thread."""
+    chunk_finished = Signal(int, int, str)
+
+
+def encode_image(image, fmt="PNG", quality=-1, max_side=0):
+    """Encode a QImage for upload. Safe to call from a worker thread.
+
+    fmt/quality are passed to QImage.save (quality -1 = Qt default).
+    max_side > 0 downscales larger captures before encoding.
+    """
+    if max_side and max(image.width(), image.height()) > max_side:
+        image = image.scaled(max_side, max_side, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    byte_array = QByteArray()
+    # Pre-size the buffer so the encoder does not repeatedly grow/copy it
+    byte_array.reserve(max(1 << 20, image.width() * image.height() // 2))
+    buffer = QBuffer(byte_array)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, fmt, quality)
+    buffer.close()
+    # QByteArray.data() already returns bytes; avoid wrapping it in another copy
+    return byte_array.data()
 
 
 def run_app():
@@ -27,22 +61,29 @@ def run_app():
     main_window.show()
 
     snipping_tool = SnippingTool()
-    result_window = ResultWindow()
     progress_overlay = ProgressOverlay()
 
-    # Wire up "Open Result" button
-    main_window.open_result_requested.connect(result_window.force_show)
-
     result_holder = OCRResultHolder()
+    trans_holder = TranslationResultHolder()
+
+    # The result window (and the translator behind it) is only needed once
+    # the user actually captures something, so build it on first use
+    result_window = None
 
-    def check_result():
-        if result_holder.ready:
-            result_holder.ready = False
-            on_ocr_finished(result_holder.result)
+    def get_result_window():
+        nonlocal result_window
+        if result_window is None:
+            from ui.result_window import ResultWindow
+            result_window = ResultWindow()
+            result_window.translate_requested.connect(on_translate_request)
+            trans_holder.chunk_finished.connect(on_translation_chunk)
+        return result_window
 
-    result_timer = QTimer()
-    result_timer.timeout.connect(check_result)
-    result_timer.start(100)
+    def show_result_window():
+        get_result_window().force_show()
+
+    # Wire up "Open Result" button
+    main_window.open_result_requested.connect(show_result_window)
 
     # Track windows to restore after screenshot
     hidden_windows = []
@@ -79,40 +120,48 @@ def run_app():
 
         if pixmap:
             print("Capture taken, processing...")
+            # Let the overlay paint before doing any conversion/import work
             progress_overlay.show_progress()
-
-            byte_array = QByteArray()
-            buffer = QBuffer(byte_array)
-            buffer.open(QIODevice.WriteOnly)
-            pixmap.save(buffer, "PNG")
-            img_bytes = bytes(byte_array.data())
-
-            # Get screenshot model from config
-            screenshot_model = config.get("screenshot_model", "PP-OCRv5")
-
-            def do_ocr():
-                try:
-                    res = ocr_client.ocr_image(img_bytes, model_override=screenshot_model)
-                    result_holder.result = res
-                    result_holder.ready = True
-                except Exception as e:
-                    result_holder.result = {"error": str(e)}
-                    result_holder.ready = True
-
-            t = threading.Thread(target=do_ocr)
-            t.daemon = True
-            t.start()
+            QTimer.singleShot(0, lambda: submit_ocr(pixmap))
         else:
             print("Capture cancelled")
 
+    def submit_ocr(pixmap):
+        """Convert the capture and hand it to the OCR pool (GUI thread)."""
+        # QPixmap is GUI-thread only; QImage can be encoded on the worker
+        image = pixmap.toImage()
+        from services.ocr_engine import ocr_client
+
+        # Get screenshot model and upload encoding from config
+        screenshot_model = config.view.screenshot_model
+        upload_format = config.get("upload_format", "JPEG")
+        upload_quality = config.get("upload_quality", 85)
+        upload_max_side = config.get("upload_max_side", 0)
+
+        def do_ocr():
+            try:
+                img_bytes = encode_image(image, upload_format, upload_quality, upload_max_side)
+                res = ocr_client.ocr_image(img_bytes, model_override=screenshot_model)
+                # API rejected the payload (not an auth/rate-limit/server error): retry as lossless PNG
+                if res.get("status_code") in PAYLOAD_REJECTED_STATUS and upload_format.upper() != "PNG":
+                    img_bytes = encode_image(image, "PNG", -1, upload_max_side)
+                    res = ocr_client.ocr_image(img_bytes, model_override=screenshot_model)
+            except Exception as e:
+                res = {"error": str(e)}
+            # Emitted from the worker thread; Qt queues it to the GUI thread
+            result_holder.finished.emit(res)
+
+        _ocr_pool.submit(do_ocr)
+
     def on_ocr_finished(res):
         progress_overlay.hide()
+        result_window = get_result_window()
 
         if "error" in res:
             error_info = f"API Error: {res['error']}\n\nRaw Response:\n{res.get('raw_response', '')}"
             result_window.set_text(error_info)
-        elif "words_result" in res:
-            text_lines = [item["words"] for item in res["words_result"]]
+        elif "text_lines" in res:
+            text_lines = res["text_lines"]
             full_text = "\n".join(text_lines)
             if not full_text:
                 full_text = f"(No text found)\n\nDebug: {res.get('debug_info', '')}"
@@ -126,6 +175,7 @@ def run_app():
             result_window.set_text(f"Unknown Result Format:\n{res}")
 
     snipping_tool.capture_done.connect(on_capture_done)
+    result_holder.finished.connect(on_ocr_finished)
 
     # ========== HOTKEY MANAGEMENT ==========
     from services.hotkey_manager import hotkey_manager
@@ -140,22 +190,52 @@ def run_app():
     hotkey_manager.translate_triggered.connect(trigger_trans_snip)
     
     # Register initial hotkeys from config
-    screenshot_hk = config.get("hotkey_cature") or "F4"
-    translate_hk = config.get("hotkey_trans_capture") or "F6"
-    show_main_hk = config.get("hotkey_show_main") or "F9"
-    hotkey_manager.register_screenshot_hotkey(screenshot_hk)
-    hotkey_manager.register_translate_hotkey(translate_hk)
-    hotkey_manager.register_show_main_hotkey(show_main_hk)
+    hotkey_manager.register_screenshot_hotkey(config.view.hotkey_capture)
+    hotkey_manager.register_translate_hotkey(config.view.hotkey_translate)
+    hotkey_manager.register_show_main_hotkey(config.view.hotkey_show_main)
 
     # Translation Logic
-    from services.translator import translator
+    # Long texts are split into chunks that are translated concurrently;
+    # results are shown in order as soon as each leading chunk is ready.
+    # The generation counter drops results from a superseded request.
+    translate_generation = 0
+    translate_parts = []
 
     def on_translate_request(text, mode, target_lang):
+        nonlocal translate_generation, translate_parts
+        from services.translator import translator, split_text
+        result_window.trans_editor.clear()
         result_window.trans_editor.setPlaceholderText(f"Translating to {target_lang}...")
-        res = translator.translate(text, mode, target_lang)
-        result_window.trans_editor.setPlainText(res)
 
-    result_window.translate_requested.connect(on_translate_request)
+        translate_generation += 1
+        generation = translate_generation
+        chunks = split_text(text)
+        translate_parts = [None] * len(chunks)
+
+        def do_translate(idx, chunk):
+            try:
+                res = translator.translate(chunk, mode, target_lang)
+            except Exception as e:
+                res = f"Translation Error: {e}"
+            trans_holder.chunk_finished.emit(generation, idx, res)
+
+        # Run the LLM round-trips off the GUI thread
+        for idx, chunk in enumerate(chunks):
+            _ocr_pool.submit(do_translate, idx, chunk)
+
+    def on_translation_chunk(generation, idx, res):
+        if generation != translate_generation:
+            return
+        translate_parts[idx] = res
+        ready = []
+        for part in translate_parts:
+            if part is None:
+                break
+            ready.append(part)
+        # Only repaint when this chunk extended the in-order prefix
+        if len(ready) > idx:
+            result_window.trans_editor.setPlainText("\n\n".join(ready))
+
 
     # ========== SYSTEM TRAY ==========
     tray_icon = QSystemTrayIcon()
@@ -167,11 +247,9 @@ def run_app():
     # 显示主窗口（同时关闭设置窗口，防止卡在后台）
     action_show_main = QAction("🏠 显示主窗口", None)
     def show_main_window():
-        # Close any open settings dialogs to prevent them from getting stuck
-        from ui.settings_dialog import SettingsDialog
-        for widget in QApplication.topLevelWidgets():
-            if isinstance(widget, SettingsDialog):
-                widget.close()
+        # Close an open settings dialog to prevent it from getting stuck
+        if main_window.settings_dialog:
+            main_window.settings_dialog.close()
         main_window.show()
         main_window.raise_()
         main_window.activateWindow()
@@ -194,7 +272,7 @@ def run_app():
     tray_menu.addSeparator()
 
     action_show_result = QAction("📄 显示识别窗口", None)
-    action_show_result.triggered.connect(result_window.force_show)
+    action_show_result.triggered.connect(show_result_window)
     tray_menu.addAction(action_show_result)
 
     tray_menu.addSeparator()
@@ -204,29 +282,7 @@ def run_app():
     tray_menu.addAction(action_settings)
 
     action_exit = QAction("❌ 退出", None)
-    def exit_app():
-        # Check if there are any running tasks by looking at the table
-        has_running_tasks = main_window._has_processing_items()
-        
-        if has_running_tasks:
-            # Task is running, ask for confirmation
-            reply = QMessageBox.question(
-                main_window,
-                "确认退出",
-                "有任务正在执行中，强制退出将会终止任务。\n是否确认退出？",
-                QMessageBox.Yes | QMessageBox.No,
-                QMessageBox.No
-            )
-            if reply == QMessageBox.No:
-                return
-            # User confirmed, stop the task first
-            from services.batch_processor import batch_processor
-            batch_processor.stop()
-        
-        tray_icon.hide()
-        QApplication.quit()
-        os._exit(0)  # Force exit to kill all threads
-    action_exit.triggered.connect(exit_app)
+    action_exit.triggered.connect(main_window.exit_app)
     tray_menu.addAction(action_exit)
 
     tray_icon.setContextMenu(tray_menu)
@@ -241,15 +297,45 @@ def run_app():
 
     # Handle minimize to tray
     def on_main_close(event):
-        if config.get("minimize_to_tray", False):
+        if config.view.minimize_to_tray:
             event.ignore()
             main_window.hide()
         else:
             event.accept()
-            exit_app()
+            main_window.exit_app()
 
     main_window.closeEvent = on_main_close
 
+    def shutdown():
+        """Release resources once the event loop has stopped."""
+        tray_icon.hide()
+        hotkey_manager.unregister_all()
+        _ocr_pool.shutdown(wait=False, cancel_futures=True)
+        pools = [_ocr_pool]
+        # Batch and OCR services are imported lazily; only release loaded ones
+        batch_module = sys.modules.get("services.batch_processor")
+        if batch_module:
+            batch_module.batch_processor.shutdown()
+            pools.append(batch_module.batch_processor.executor)
+        ocr_engine = sys.modules.get("services.ocr_engine")
+        if ocr_engine:
+            ocr_engine.ocr_client.close()
+        config.flush()  # Persist any debounced config changes
+
+        # Pool threads are non-daemon, so the interpreter would join a running
+        # request at exit and keep a windowless process alive until its
+        # network timeouts and retries run out. Give them a short grace
+        # period, then exit without waiting further.
+        deadline = time.monotonic() + SHUTDOWN_GRACE_SECONDS
+        for pool in pools:
+            for thread in list(pool._threads):
+                thread.join(max(0.0, deadline - time.monotonic()))
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(0)
+
+    app.aboutToQuit.connect(shutdown)
+
     sys.exit(app.exec())
 
 
@@ -3,12 +3,52 @@ import sys
 import json
 import csv
 import re
+import functools
+import mmap
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from html.parser import HTMLParser
+from xml.sax.saxutils import escape as xml_escape
 from PySide6.QtCore import QObject, Signal, QRunnable, QThreadPool
 from services.ocr_engine import ocr_client
 from app_config import config
 
+# Threads in the batch HTTP pool: the UI's max of 20 concurrent files; kept
+# below ocr_engine.HTTP_POOL_SIZE so every upload gets a pooled connection
+BATCH_POOL_SIZE = 20
+
+# Input files at least this large are memory-mapped instead of read into bytes
+MMAP_THRESHOLD = 1 << 20
+
+
+# Optional export/parsing dependencies; each feature falls back when missing
+try:
+    import lxml.html
+    _LXML_PARSER = lxml.html.HTMLParser(recover=True)
+except ImportError:
+    lxml = None
+
+try:
+    from docx import Document
+except ImportError:
+    Document = None
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+try:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import cm
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+except ImportError:
+    SimpleDocTemplate = None
+
 
 class HTMLTableParser(HTMLParser):
     """Parse HTML table into 2D list for Excel export"""
@@ -17,7 +57,7 @@ class HTMLTableParser(HTMLParser):
         self.tables = []
         self.current_table = []
         self.current_row = []
-        self.current_cell = ""
+        self.current_cell = []  # text fragments, joined when the cell closes
         self.in_table = False
         self.in_row = False
         self.in_cell = False
@@ -33,24 +73,22 @@ class HTMLTableParser(HTMLParser):
             self.current_row = []
         elif tag in ("td", "th") and self.in_row:
             self.in_cell = True
-            self.current_cell = ""
+            self.current_cell = []
             # Parse colspan/rowspan
             self.cell_colspan = 1
             self.cell_rowspan = 1
             for attr, val in attrs:
                 if attr == "colspan":
-                    try: self.cell_colspan = int(val)
-                    except: pass
+                    self.cell_colspan = _parse_span(val)
                 elif attr == "rowspan":
-                    try: self.cell_rowspan = int(val)
-                    except: pass
+                    self.cell_rowspan = _parse_span(val)
     
     def handle_endtag(self, tag):
         if tag in ("td", "th") and self.in_cell:
             self.in_cell = False
             # Add cell with colspan handling
-            for _ in range(self.cell_colspan):
-                self.current_row.append(self.current_cell.strip())
+            cell_text = "".join(self.current_cell).strip()
+            self.current_row.extend([cell_text] * self.cell_colspan)
         elif tag == "tr" and self.in_row:
             self.in_row = False
             if self.current_row:
@@ -62,11 +100,47 @@ class HTMLTableParser(HTMLParser):
     
     def handle_data(self, data):
         if self.in_cell:
-            self.current_cell += data
+            self.current_cell.append(data)
+
+
+def _write_text(path, content):
+    """Write a text export file as UTF-8 (platform line endings, as before)."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def _parse_span(value):
+    """colspan/rowspan attribute value -> int; 1 if missing or malformed."""
+    if value:
+        value = value.strip()
+        if value.isdecimal():
+            return int(value)
+    return 1
 
 
 def parse_html_tables(html_content):
     """Parse HTML and extract tables as 2D lists"""
+    if lxml is not None:
+        # libxml2 does the tokenizing in C; fall through to the pure-Python
+        # parser only if lxml is unavailable
+        try:
+            root = lxml.html.fromstring(html_content, parser=_LXML_PARSER)
+        except Exception:
+            return []
+        tables = []
+        for table in root.iter("table"):
+            rows = []
+            for tr in table.xpath("./tr | ./thead/tr | ./tbody/tr | ./tfoot/tr"):
+                row = []
+                for cell in tr.xpath("./td | ./th"):
+                    # Colspan cells are repeated so columns stay aligned
+                    row.extend([cell.text_content().strip()] * _parse_span(cell.get("colspan")))
+                if row:
+                    rows.append(row)
+            if rows:
+                tables.append(rows)
+        return tables
+
     parser = HTMLTableParser()
     try:
         parser.feed(html_content)
@@ -75,23 +149,44 @@ def parse_html_tables(html_content):
         return []
 
 
+# Markdown table separator row, e.g. |---|:--:|
+_MD_SEPARATOR_RE = re.compile(r"[|\-: ]*")
+
+
+# One markdown line, surrounding whitespace excluded: optional "#"-"###" heading
+# marker (only when followed by text) and the line body
+_MD_LINE_RE = re.compile(r"^[^\S\n]*(?:(#{1,3}) (?=[^\n]*\S))?([^\n]*?)[^\S\n]*$", re.M)
+
+
+def _md_line_to_html(match):
+    hashes, body = match.groups()
+    if hashes:
+        level = len(hashes)
+        return f"<h{level}>{body}</h{level}>"
+    return f"<p>{body}</p>" if body else ""
+
+
+def markdown_to_simple_html(content):
+    """Render markdown as h1-h3 headings and paragraphs, one element per non-empty line."""
+    return _MD_LINE_RE.sub(_md_line_to_html, content).replace("\n", "")
+
+
 def parse_markdown_table(md_text):
     """Parse markdown tables to list of 2D lists"""
     tables = []
     current_table = []
     in_table = False
     
-    for line in md_text.split("\n"):
+    for line in md_text.splitlines():
         line = line.strip()
         
         # Detect table row
         if line.startswith("|") and line.endswith("|"):
             # Skip separator lines like |---|---|
-            stripped = line.replace("|", "").replace("-", "").replace(":", "").replace(" ", "")
-            if not stripped:
+            if _MD_SEPARATOR_RE.fullmatch(line):
                 continue
             
-            cells = [c.strip() for c in line.split("|")[1:-1]]
+            cells = [c.strip() for c in line[1:-1].split("|")]
             if cells:
                 current_table.append(cells)
                 in_table = True
@@ -109,6 +204,41 @@ def parse_markdown_table(md_text):
     return tables if tables else None
 
 
+# Every line boundary str.splitlines() breaks on
+_LINE_BREAK_RE = re.compile("[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
+def _result_lines(text, text_lines):
+    """Lines of the plain-text result, reusing the OCR line list when there is one.
+
+    Entries may hold several lines (e.g. markdown-only or multi-line block
+    results); then the joined text is split so each line gets its own row.
+    """
+    if text_lines and not any(map(_LINE_BREAK_RE.search, text_lines)):
+        return text_lines
+    return text.splitlines()
+
+
+def _iter_md_blocks(lines):
+    """Classify markdown lines once for the DOCX/PDF writers.
+
+    Yields (kind, level, text): kind is "h" (level 1-3, marker removed),
+    "p" (level 0) or "blank"; text is the stripped line.
+    """
+    for line in lines:
+        line = line.strip()
+        if not line:
+            yield "blank", 0, ""
+            continue
+        # Count leading '#' in one C-level pass instead of three startswith probes
+        body = line.lstrip("#")
+        level = len(line) - len(body)
+        if 1 <= level <= 3 and body.startswith(" "):
+            yield "h", level, body[1:]
+        else:
+            yield "p", 0, line
+
+
 def parse_all_markdown_tables(md_text):
     """Extract all tables from markdown content for Excel export."""
     tables = parse_markdown_table(md_text)
@@ -117,31 +247,109 @@ def parse_all_markdown_tables(md_text):
     return tables
 
 
+@functools.lru_cache(maxsize=1)
+def _get_cn_font():
+    """Register a Chinese-capable font for PDF export once per process."""
+    try:
+        pdfmetrics.registerFont(TTFont('SimSun', 'C:/Windows/Fonts/simsun.ttc'))
+        return 'SimSun'
+    except:
+        try:
+            pdfmetrics.registerFont(TTFont('MSYaHei', 'C:/Windows/Fonts/msyh.ttc'))
+            return 'MSYaHei'
+        except:
+            return 'Helvetica'
+
+
+@functools.lru_cache(maxsize=None)
+def _get_pdf_styles(font_name):
+    """Paragraph styles (normal, h1, h2, h3) for PDF export in the given font."""
+    styles = getSampleStyleSheet()
+    normal_style = ParagraphStyle(
+        'Normal_CN',
+        parent=styles['Normal'],
+        fontName=font_name,
+        fontSize=12,
+        leading=18,
+        wordWrap='CJK'
+    )
+    h1_style = ParagraphStyle(
+        'H1_CN',
+        parent=styles['Heading1'],
+        fontName=font_name,
+        fontSize=18,
+        leading=24,
+        spaceAfter=12
+    )
+    h2_style = ParagraphStyle(
+        'H2_CN',
+        parent=styles['Heading2'],
+        fontName=font_name,
+        fontSize=16,
+        leading=20,
+        spaceAfter=10
+    )
+    h3_style = ParagraphStyle(
+        'H3_CN',
+        parent=styles['Heading3'],
+        fontName=font_name,
+        fontSize=14,
+        leading=18,
+        spaceAfter=8
+    )
+    return normal_style, h1_style, h2_style, h3_style
+
+
 class WorkerSignals(QObject):
     progress_update = Signal(int, int, int)
     status_update = Signal(int, str)
     result_update = Signal(int, str)
+    completed = Signal(int, str, int, int, str)  # row, status, current, total, result
     finished = Signal()
     stopped = Signal()  # Emitted when user stops the task
     error_occurred = Signal(int, str)
 
 
 class BatchWorker(QRunnable):
-    def __init__(self, mode, files, model_override, output_dir, export_fmt, max_workers=5, row_indices=None):
+    def __init__(self, mode, files, model_override, output_dir, export_fmt, max_workers=5, row_indices=None,
+                 executor=None):
         super().__init__()
         self.mode = mode
         self.files = files
         self.model_override = model_override
         self.output_dir = output_dir
         self.export_fmt = export_fmt
+        # Only the JSON exports write the full API response; other formats
+        # let it be freed as soon as the response is parsed
+        fmt = export_fmt.lower()
+        self._needs_raw_result = fmt == "json" or "版面树" in fmt or "layout" in fmt
         self.max_workers = max_workers
+        # Pool that runs the per-file requests (BatchProcessor's by default)
+        self.executor = executor or batch_processor.executor
         # row_indices maps internal file indices to actual table row indices
-        # If not provided, assume 1:1 mapping (0, 1, 2, ...)
-        self.row_indices = row_indices if row_indices else list(range(len(files)))
+        # (one entry per file). If not provided, assume 1:1 mapping (0, 1, 2, ...)
+        self.row_indices = tuple(row_indices) if row_indices else tuple(range(len(files)))
         self.signals = WorkerSignals()
         self._stop_event = threading.Event()  # Use Event for faster response
         self._completed_count = 0
         self._lock = threading.Lock()
+        # Minimum spacing between API calls, shared by all pool threads
+        self.request_interval = config.get("batch_request_interval", 0.5)
+        self._next_request_at = time.monotonic()
+
+    def _wait_for_request_slot(self):
+        """Block until this thread may issue its API call.
+
+        Reserves the next slot under the lock and waits on the stop event, so
+        pending waits end immediately when the user stops the batch.
+        Returns False if stopped while waiting.
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_request_at)
+            self._next_request_at = slot + self.request_interval
+        delay = slot - now
+        return delay <= 0 or not self._stop_event.wait(delay)
 
     def stop(self):
         """Request stop - sets event flag immediately"""
@@ -158,67 +366,62 @@ class BatchWorker(QRunnable):
         "用户已终止任务" status that was set by the main thread.
         """
         # Get the actual table row index for UI updates
-        row_index = self.row_indices[index] if index < len(self.row_indices) else index
+        row_index = self.row_indices[index]
+        stopped = self._stop_event.is_set
         
         # Check if stopped before starting - don't waste time on new tasks
-        if self._stop_event.is_set():
+        if stopped():
             # Don't emit anything - main thread already set the status
             return index, row_index, None, "用户已终止任务"
 
         try:
-            # Only update UI if not stopped
-            if not self._stop_event.is_set():
-                self.signals.status_update.emit(row_index, "处理中...")
-                self.signals.progress_update.emit(row_index, 50, 100)
-
-            # Check before reading file
-            if self._stop_event.is_set():
-                return index, row_index, None, "用户已终止任务"
-
-            with open(filepath, "rb") as f:
-                file_bytes = f.read()
+            self.signals.status_update.emit(row_index, "处理中...")
+            self.signals.progress_update.emit(row_index, 50, 100)
 
             ext = os.path.splitext(filepath)[1].lower()
             is_document = ext in ['.pdf', '.xps', '.epub', '.mobi', '.fb2', '.cbz']
             file_type = 0 if is_document else 1
 
-            # Check before API call
-            if self._stop_event.is_set():
+            # Respect the request interval; also checks stop before API call
+            if not self._wait_for_request_slot() or stopped():
                 return index, row_index, None, "用户已终止任务"
 
+            # Read the file only once it is our turn, so waiting workers hold no data.
+            # Large files are mapped rather than copied; base64 reads the mapping directly.
+            with open(filepath, "rb") as f:
+                if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+                    file_data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    file_data = f.read()
+
             # Make API call
-            res = ocr_client.ocr_file(file_bytes, file_type=file_type, 
-                                       model_override=self.model_override,
-                                       stop_event=self._stop_event)
+            try:
+                res = ocr_client.ocr_file(file_data, file_type=file_type, 
+                                           model_override=self.model_override,
+                                           stop_event=self._stop_event,
+                                           include_raw=self._needs_raw_result)
+            finally:
+                if isinstance(file_data, mmap.mmap):
+                    file_data.close()
 
             # ============== CRITICAL SECTION ==============
             # After API call returns, check stop_event FIRST
             # If stopped, DO NOT update UI - just return silently
             # This prevents overwriting "用户已终止任务" set by main thread
-            if self._stop_event.is_set():
+            if stopped():
                 return index, row_index, None, "用户已终止任务"
             # ================================================
 
             # Handle API errors (user termination handled above)
             if "error" in res:
                 err_msg = res['error']
-                # Double-check stop_event before updating UI
-                if self._stop_event.is_set():
-                    return index, row_index, None, "用户已终止任务"
                 if 'raw_response' in res:
                     err_msg += f"\n{str(res['raw_response'])[:200]}..."
-                self.signals.status_update.emit(row_index, "失败")
-                self.signals.progress_update.emit(row_index, 100, 100)
-                self.signals.result_update.emit(row_index, err_msg)
+                self.signals.completed.emit(row_index, "失败", 100, 100, err_msg)
                 return index, row_index, "失败", err_msg
 
             # Get text content
-            text_lines = []
-            if "words_result" in res and res["words_result"]:
-                for item in res["words_result"]:
-                    word = item.get("words", "")
-                    if isinstance(word, str):
-                        text_lines.append(word)
+            text_lines = [line for line in res.get("text_lines", ()) if isinstance(line, str)]
 
             markdown_text = res.get("markdown", "")
             tables_html = res.get("tables_html", [])
@@ -229,134 +432,71 @@ class BatchWorker(QRunnable):
 
             if full_text or tables_html:
                 # Save results
-                export_result = self.save_results(filepath, full_text, markdown_text, tables_html, layout_data, raw_result)
+                export_result = self.save_results(filepath, full_text, markdown_text, tables_html, layout_data, raw_result,
+                                                  text_lines)
                 
-                # Check stop_event before updating UI
-                if self._stop_event.is_set():
+                # Check stop_event before updating UI (saving can take a while)
+                if stopped():
                     # File was saved but user stopped - don't update UI
                     # The work is done but we respect user's stop request
                     return index, row_index, None, "用户已终止任务"
                 
                 # Update UI with success
-                self.signals.status_update.emit(row_index, "成功")
-                self.signals.progress_update.emit(row_index, 100, 100)
-                self.signals.result_update.emit(row_index, export_result)
+                self.signals.completed.emit(row_index, "成功", 100, 100, export_result)
                 return index, row_index, "成功", export_result
             else:
-                # Check stop_event before updating UI
-                if self._stop_event.is_set():
-                    return index, row_index, None, "用户已终止任务"
-                self.signals.status_update.emit(row_index, "无内容")
-                self.signals.progress_update.emit(row_index, 100, 100)
-                self.signals.result_update.emit(row_index, "未识别到文字")
+                self.signals.completed.emit(row_index, "无内容", 100, 100, "未识别到文字")
                 return index, row_index, "无内容", "未识别到文字"
 
         except Exception as e:
             # Always check stop_event before any UI update
-            if self._stop_event.is_set():
+            if stopped():
                 return index, row_index, None, "用户已终止任务"
-            self.signals.status_update.emit(row_index, "错误")
-            self.signals.progress_update.emit(row_index, 100, 100)
-            self.signals.result_update.emit(row_index, str(e)[:100])
+            self.signals.completed.emit(row_index, "错误", 100, 100, str(e)[:100])
             return index, row_index, "错误", str(e)
 
     def run(self):
-        """Main worker run method - uses ThreadPoolExecutor for parallel processing
+        """Main worker run method - runs files in parallel on the batch HTTP pool
         
         Key improvements:
         1. Each task updates UI immediately upon completion (not batched)
         2. Stop is processed immediately - we don't wait for running tasks
         3. Running tasks complete in background, their results are already sent to UI
         """
-        import time
-        from concurrent.futures import ThreadPoolExecutor
-        
         was_stopped = False
-        executor = None
+        futures = {}
         
         try:
-            if not os.path.exists(self.output_dir):
-                os.makedirs(self.output_dir)
-
-            # Create executor (not using 'with' to allow non-blocking shutdown)
-            executor = ThreadPoolExecutor(max_workers=self.max_workers)
-            futures = {}
-            
-            # Submit tasks with delay between each
-            for i, filepath in enumerate(self.files):
-                # Check stop before submitting new task
-                if self._stop_event.is_set():
-                    # Mark all remaining as stopped
-                    for j in range(i, len(self.files)):
-                        row_idx = self.row_indices[j] if j < len(self.row_indices) else j
-                        self.signals.status_update.emit(row_idx, "已终止")
-                        self.signals.result_update.emit(row_idx, "用户已终止任务")
-                    was_stopped = True
-                    break
-                
-                future = executor.submit(self.process_single_file, i, filepath)
-                futures[future] = i
-                
-                # Add delay between task submissions (except for last one)
-                # Use short sleep intervals to check stop_event more frequently
-                if i < len(self.files) - 1:
-                    # First 2-second delay (reduced from 5s for better throughput)
-                    for _ in range(20):  # 2 seconds total, check every 0.1s
-                        if self._stop_event.is_set():
-                            break
-                        time.sleep(0.1)
-                    
-                    # Check if previous task is still processing
-                    # If still processing, wait up to 3 more seconds
-                    if not self._stop_event.is_set():
-                        prev_future = list(futures.keys())[-1] if futures else None
-                        if prev_future and not prev_future.done():
-                            # Previous task still running, add up to 3 second delay
-                            for _ in range(30):  # 3 seconds max
-                                if self._stop_event.is_set():
-                                    break
-                                if prev_future.done():
-                                    break  # Task completed, proceed immediately
-                                time.sleep(0.1)
-            
-            # If stop was triggered during submission
-            if self._stop_event.is_set():
-                was_stopped = True
-                # Mark any unstarted tasks as stopped
-                for i in range(len(self.files)):
-                    row_idx = self.row_indices[i] if i < len(self.row_indices) else i
-                    # Only update if still showing pending/processing
-                    # (completed tasks already updated themselves)
-                self._finish_immediately(executor, futures)
-                return
-            
-            # Wait for remaining futures with very short timeout
-            # This allows us to check stop_event frequently
-            pending = set(futures.keys())
-            while pending and not self._stop_event.is_set():
-                # Check each pending future with short timeout
-                done = set()
-                for future in list(pending):
-                    if future.done():
-                        done.add(future)
-                        # Result already sent to UI by process_single_file
-                        try:
-                            future.result(timeout=0)  # Just to catch exceptions
-                        except:
-                            pass
-                
-                pending -= done
+            os.makedirs(self.output_dir, exist_ok=True)
+
+            # Keep at most max_workers of this batch in flight on the shared
+            # pool; refill as each file completes. The short wait timeout
+            # keeps stop_event responsive without scanning pending futures.
+            total = len(self.files)
+            next_index = 0
+            pending = set()
+            while (pending or next_index < total) and not self._stop_event.is_set():
+                while next_index < total and len(pending) < self.max_workers:
+                    future = self.executor.submit(self.process_single_file, next_index, self.files[next_index])
+                    futures[future] = next_index
+                    pending.add(future)
+                    next_index += 1
                 
-                if pending and not self._stop_event.is_set():
-                    time.sleep(0.1)  # Short sleep to avoid busy loop
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    # Result already sent to UI by process_single_file
+                    try:
+                        future.result()  # Just to catch exceptions
+                    except:
+                        pass
             
-            # If stop was triggered while waiting
+            # If stop was triggered, mark in-flight and never-submitted tasks
             if self._stop_event.is_set():
                 was_stopped = True
-                # Update any tasks that are still pending/processing
-                for future in pending:
-                    idx = futures[future]
-                    row_idx = self.row_indices[idx] if idx < len(self.row_indices) else idx
+                unfinished = sorted(futures[future] for future in pending)
+                unfinished.extend(range(next_index, total))
+                for idx in unfinished:
+                    row_idx = self.row_indices[idx]
                     self.signals.status_update.emit(row_idx, "已终止")
                     self.signals.result_update.emit(row_idx, "用户已终止任务")
 
@@ -365,120 +505,103 @@ class BatchWorker(QRunnable):
             import traceback
             traceback.print_exc()
         finally:
-            # Shutdown executor without waiting (let running tasks finish in background)
-            if executor:
-                executor.shutdown(wait=False, cancel_futures=True)
+            # The pool is shared, so only drop this batch's queued tasks;
+            # running ones finish in the background
+            for future in futures:
+                future.cancel()
             
             # Emit appropriate signal
             if was_stopped or self._stop_event.is_set():
                 self.signals.stopped.emit()
             else:
                 self.signals.finished.emit()
-    
-    def _finish_immediately(self, executor, futures):
-        """Helper to finish immediately when stopped during submission"""
-        if executor:
-            executor.shutdown(wait=False, cancel_futures=True)
 
-    def save_results(self, filepath, text, markdown_text, tables_html, layout_data, raw_result):
+    def save_results(self, filepath, text, markdown_text, tables_html, layout_data, raw_result, text_lines=None):
         base_name = os.path.splitext(os.path.basename(filepath))[0]
         fmt = self.export_fmt.lower()
-        
-        def p(ext): return os.path.join(self.output_dir, f"{base_name}.{ext}")
+        base_path = os.path.join(self.output_dir, base_name)
 
         try:
             # ========== PP-OCRv5 Formats ==========
             # Note: fmt is lowercased, so we check for lowercase versions
             if fmt == "txt":
-                with open(p("txt"), "w", encoding="utf-8") as f:
-                    f.write(text)
+                _write_text(f"{base_path}.txt", text)
                 return f"已导出: {base_name}.txt"
             
             elif fmt == "json":
-                with open(p("json"), "w", encoding="utf-8") as f:
-                    output = {"file": os.path.basename(filepath), "text": text}
-                    if raw_result:
-                        output["raw_result"] = raw_result
-                    json.dump(output, f, ensure_ascii=False, indent=2)
+                output = {"file": os.path.basename(filepath), "text": text}
+                if raw_result:
+                    output["raw_result"] = raw_result
+                _write_text(f"{base_path}.json", json.dumps(output, ensure_ascii=False, indent=2))
                 return f"已导出: {base_name}.json"
             
             elif "csv" in fmt:
-                with open(p("csv"), "w", newline="", encoding="utf-8") as f:
+                with open(f"{base_path}.csv", "w", newline="", encoding="utf-8") as f:
                     writer = csv.writer(f)
                     writer.writerow(["行号", "文本"])
-                    for idx, line in enumerate(text.split("\n")):
-                        if line.strip():
-                            writer.writerow([idx + 1, line])
+                    writer.writerows((idx, line) for idx, line in enumerate(_result_lines(text, text_lines), 1)
+                                     if line.strip())
                 return f"已导出: {base_name}.csv"
             
             elif "可搜索pdf" in fmt:
-                with open(p("txt"), "w", encoding="utf-8") as f:
-                    f.write(text)
+                _write_text(f"{base_path}.txt", text)
                 return f"已导出: {base_name}.txt (可搜索PDF开发中)"
             
             elif "带标注" in fmt:
-                with open(p("txt"), "w", encoding="utf-8") as f:
-                    f.write(text)
+                _write_text(f"{base_path}.txt", text)
                 return f"已导出: {base_name}.txt (标注图片开发中)"
 
             # ========== PP-StructureV3 Formats ==========
             elif "docx" in fmt or "word" in fmt:
+                if Document is None:
+                    _write_text(f"{base_path}.md", f"# {base_name}\n\n{markdown_text or text}")
+                    return f"导出失败: 需要安装python-docx (已保存为MD)"
                 try:
-                    from docx import Document
                     doc = Document()
                     doc.add_heading(base_name, 0)
                     
-                    content = markdown_text if markdown_text else text
+                    lines = markdown_text.splitlines() if markdown_text else _result_lines(text, text_lines)
                     
-                    for line in content.split("\n"):
-                        line = line.strip()
-                        if not line:
-                            continue
-                        if line.startswith("# "):
-                            doc.add_heading(line[2:], level=1)
-                        elif line.startswith("## "):
-                            doc.add_heading(line[3:], level=2)
-                        elif line.startswith("### "):
-                            doc.add_heading(line[4:], level=3)
-                        elif line.startswith("- ") or line.startswith("* "):
-                            doc.add_paragraph(line[2:], style='List Bullet')
-                        else:
-                            doc.add_paragraph(line)
+                    for kind, level, line in _iter_md_blocks(lines):
+                        if kind == "h":
+                            doc.add_heading(line, level=level)
+                        elif kind == "p":
+                            if line.startswith("- ") or line.startswith("* "):
+                                doc.add_paragraph(line[2:], style='List Bullet')
+                            else:
+                                doc.add_paragraph(line)
                     
-                    doc.save(p("docx"))
+                    doc.save(f"{base_path}.docx")
                     return f"已导出: {base_name}.docx"
-                except ImportError:
-                    with open(p("md"), "w", encoding="utf-8") as f:
-                        f.write(f"# {base_name}\n\n{markdown_text or text}")
-                    return f"导出失败: 需要安装python-docx (已保存为MD)"
                 except Exception as e:
-                    with open(p("md"), "w", encoding="utf-8") as f:
-                        f.write(f"# {base_name}\n\n{markdown_text or text}")
+                    _write_text(f"{base_path}.md", f"# {base_name}\n\n{markdown_text or text}")
                     return f"DOCX导出失败: {str(e)[:30]}"
             
             elif "xlsx" in fmt or "excel" in fmt:
+                if openpyxl is None:
+                    with open(f"{base_path}.csv", "w", newline="", encoding="utf-8") as f:
+                        writer = csv.writer(f)
+                        writer.writerow(["行号", "文本"])
+                        writer.writerows(enumerate(_result_lines(text, text_lines), 1))
+                    return f"导出失败: 需要安装openpyxl (已保存为CSV)"
                 try:
-                    import openpyxl
-                    wb = openpyxl.Workbook()
+                    # Write-only mode streams rows to disk instead of keeping
+                    # every cell object in memory; sheets must be created explicitly
+                    wb = openpyxl.Workbook(write_only=True)
                     table_count = 0
                     
                     # First try to use HTML tables from PP-StructureV3
                     if tables_html:
-                        for idx, html_table in enumerate(tables_html):
-                            parsed_tables = parse_html_tables(html_table)
-                            for t_idx, table_data in enumerate(parsed_tables):
-                                if table_count == 0:
-                                    ws = wb.active
-                                    ws.title = f"表格1"
-                                else:
-                                    ws = wb.create_sheet(title=f"表格{table_count + 1}")
-                                
-                                for row_idx, row in enumerate(table_data, 1):
-                                    for col_idx, cell in enumerate(row, 1):
-                                        ws.cell(row=row_idx, column=col_idx, value=cell)
+                        for html_table in tables_html:
+                            for table_data in parse_html_tables(html_table):
                                 table_count += 1
+                                ws = wb.create_sheet(title=f"表格{table_count}")
+                                for row in table_data:
+                                    ws.append(row)
+                        if table_count == 0:
+                            wb.create_sheet(title="表格1")  # A workbook needs at least one sheet
                         
-                        wb.save(p("xlsx"))
+                        wb.save(f"{base_path}.xlsx")
                         return f"已导出: {base_name}.xlsx ({table_count}个表格)"
                     
                     # Try to parse markdown tables (now returns list of tables)
@@ -486,50 +609,35 @@ class BatchWorker(QRunnable):
                         md_tables = parse_markdown_table(markdown_text)
                         if md_tables:
                             for t_idx, table_data in enumerate(md_tables):
-                                if t_idx == 0:
-                                    ws = wb.active
-                                    ws.title = f"表格1"
-                                else:
-                                    ws = wb.create_sheet(title=f"表格{t_idx + 1}")
-                                
-                                for row_idx, row in enumerate(table_data, 1):
-                                    for col_idx, cell in enumerate(row, 1):
-                                        ws.cell(row=row_idx, column=col_idx, value=cell)
+                                ws = wb.create_sheet(title=f"表格{t_idx + 1}")
+                                for row in table_data:
+                                    ws.append(row)
                             
-                            wb.save(p("xlsx"))
+                            wb.save(f"{base_path}.xlsx")
                             return f"已导出: {base_name}.xlsx ({len(md_tables)}个表格)"
                     
                     # Fallback: use layout data or plain text as structured data
-                    ws = wb.active
-                    ws.title = "识别结果"
+                    ws = wb.create_sheet(title="识别结果")
                     if layout_data:
                         ws.append(["序号", "类型", "内容"])
                         for idx, block in enumerate(layout_data):
                             ws.append([idx + 1, block.get("label", "text"), block.get("content", "")])
                     else:
                         ws.append(["行号", "文本"])
-                        for idx, line in enumerate(text.split("\n")):
+                        for idx, line in enumerate(_result_lines(text, text_lines)):
                             if line.strip():
                                 ws.append([idx + 1, line])
                     
-                    wb.save(p("xlsx"))
+                    wb.save(f"{base_path}.xlsx")
                     return f"已导出: {base_name}.xlsx"
-                except ImportError:
-                    with open(p("csv"), "w", newline="", encoding="utf-8") as f:
-                        writer = csv.writer(f)
-                        writer.writerow(["行号", "文本"])
-                        for idx, line in enumerate(text.split("\n")):
-                            writer.writerow([idx + 1, line])
-                    return f"导出失败: 需要安装openpyxl (已保存为CSV)"
                 except Exception as e:
                     return f"Excel导出失败: {str(e)[:30]}"
             
             elif "markdown" in fmt or "md" in fmt:
                 content = markdown_text if markdown_text else text
-                with open(p("md"), "w", encoding="utf-8") as f:
-                    if not content.startswith("#"):
-                        f.write(f"# {base_name}\n\n")
-                    f.write(content)
+                if not content.startswith("#"):
+                    content = f"# {base_name}\n\n{content}"
+                _write_text(f"{base_path}.md", content)
                 return f"已导出: {base_name}.md"
             
             elif "html" in fmt:
@@ -552,25 +660,12 @@ class BatchWorker(QRunnable):
     {'<hr>'.join(tables_html)}
 </body>
 </html>"""
-                    with open(p("html"), "w", encoding="utf-8") as f:
-                        f.write(html_content)
+                    _write_text(f"{base_path}.html", html_content)
                     return f"已导出: {base_name}.html"
                 
                 # Fallback: convert markdown to HTML
                 content = markdown_text if markdown_text else text
-                html_lines = []
-                for line in content.split("\n"):
-                    line = line.strip()
-                    if not line:
-                        continue
-                    if line.startswith("# "):
-                        html_lines.append(f"<h1>{line[2:]}</h1>")
-                    elif line.startswith("## "):
-                        html_lines.append(f"<h2>{line[3:]}</h2>")
-                    elif line.startswith("### "):
-                        html_lines.append(f"<h3>{line[4:]}</h3>")
-                    else:
-                        html_lines.append(f"<p>{line}</p>")
+                html_body = markdown_to_simple_html(content)
                 
                 html_content = f"""<!DOCTYPE html>
 <html lang="zh">
@@ -579,48 +674,35 @@ class BatchWorker(QRunnable):
     <title>{base_name}</title>
     <style>body {{ font-family: 'Microsoft YaHei', sans-serif; max-width: 900px; margin: 0 auto; padding: 20px; }}</style>
 </head>
-<body>{''.join(html_lines)}</body>
+<body>{html_body}</body>
 </html>"""
-                with open(p("html"), "w", encoding="utf-8") as f:
-                    f.write(html_content)
+                _write_text(f"{base_path}.html", html_content)
                 return f"已导出: {base_name}.html"
             
             elif "版面树" in fmt or "layout" in fmt:
                 # This format was removed in favor of just "JSON" for PP-StructureV3
                 # But we keep backward compatibility
-                with open(p("json"), "w", encoding="utf-8") as f:
-                    output = {
-                        "file": os.path.basename(filepath),
-                        "layout_data": layout_data if layout_data else [],
-                        "raw_result": raw_result
-                    }
-                    json.dump(output, f, ensure_ascii=False, indent=2)
+                output = {
+                    "file": os.path.basename(filepath),
+                    "layout_data": layout_data if layout_data else [],
+                    "raw_result": raw_result
+                }
+                _write_text(f"{base_path}.json", json.dumps(output, ensure_ascii=False, indent=2))
                 return f"已导出: {base_name}.json"
             
             elif "pdf" in fmt and "可搜索" not in fmt:
-                try:
-                    from reportlab.lib.pagesizes import A4
-                    from reportlab.pdfgen import canvas
-                    from reportlab.pdfbase import pdfmetrics
-                    from reportlab.pdfbase.ttfonts import TTFont
-                    from reportlab.lib.units import cm
-                    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-                    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-                    from reportlab.lib.enums import TA_LEFT
-                    
+                if SimpleDocTemplate is None:
                     content = markdown_text if markdown_text else text
-                    pdf_path = p("pdf")
+                    if not content.startswith("#"):
+                        content = f"# {base_name}\n\n{content}"
+                    _write_text(f"{base_path}.md", content)
+                    return f"导出失败: 需要安装reportlab (已保存为MD)"
+                try:
+                    lines = markdown_text.splitlines() if markdown_text else _result_lines(text, text_lines)
+                    pdf_path = f"{base_path}.pdf"
                     
-                    # Try to register Chinese font
-                    try:
-                        pdfmetrics.registerFont(TTFont('SimSun', 'C:/Windows/Fonts/simsun.ttc'))
-                        font_name = 'SimSun'
-                    except:
-                        try:
-                            pdfmetrics.registerFont(TTFont('MSYaHei', 'C:/Windows/Fonts/msyh.ttc'))
-                            font_name = 'MSYaHei'
-                        except:
-                            font_name = 'Helvetica'
+                    font_name = _get_cn_font()
+                    normal_style, h1_style, h2_style, h3_style = _get_pdf_styles(font_name)
                     
                     # Create document with proper margins
                     doc = SimpleDocTemplate(
@@ -632,104 +714,44 @@ class BatchWorker(QRunnable):
                         bottomMargin=2*cm
                     )
                     
-                    # Define styles
-                    styles = getSampleStyleSheet()
-                    normal_style = ParagraphStyle(
-                        'Normal_CN',
-                        parent=styles['Normal'],
-                        fontName=font_name,
-                        fontSize=12,
-                        leading=18,
-                        wordWrap='CJK'
-                    )
-                    h1_style = ParagraphStyle(
-                        'H1_CN',
-                        parent=styles['Heading1'],
-                        fontName=font_name,
-                        fontSize=18,
-                        leading=24,
-                        spaceAfter=12
-                    )
-                    h2_style = ParagraphStyle(
-                        'H2_CN',
-                        parent=styles['Heading2'],
-                        fontName=font_name,
-                        fontSize=16,
-                        leading=20,
-                        spaceAfter=10
-                    )
-                    h3_style = ParagraphStyle(
-                        'H3_CN',
-                        parent=styles['Heading3'],
-                        fontName=font_name,
-                        fontSize=14,
-                        leading=18,
-                        spaceAfter=8
-                    )
-                    
-                    # Build story (content)
-                    story = []
-                    
-                    for line in content.split("\n"):
-                        line = line.strip()
-                        if not line:
-                            story.append(Spacer(1, 6))
-                            continue
-                        
-                        # Escape XML special chars
-                        line = line.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-                        
-                        # Handle headings
-                        if line.startswith("# "):
-                            story.append(Paragraph(line[2:], h1_style))
-                        elif line.startswith("## "):
-                            story.append(Paragraph(line[3:], h2_style))
-                        elif line.startswith("### "):
-                            story.append(Paragraph(line[4:], h3_style))
-                        else:
-                            story.append(Paragraph(line, normal_style))
+                    # Build story (content); paragraphs are level 0 and fall back to
+                    # the normal style. Text is XML-escaped for Paragraph markup
+                    styles = {1: h1_style, 2: h2_style, 3: h3_style}
+                    story = [
+                        Spacer(1, 6) if kind == "blank"
+                        else Paragraph(xml_escape(line), styles.get(level, normal_style))
+                        for kind, level, line in _iter_md_blocks(lines)
+                    ]
                     
                     doc.build(story)
                     return f"已导出: {base_name}.pdf"
-                except ImportError as ie:
-                    content = markdown_text if markdown_text else text
-                    with open(p("md"), "w", encoding="utf-8") as f:
-                        if not content.startswith("#"):
-                            f.write(f"# {base_name}\n\n")
-                        f.write(content)
-                    return f"导出失败: 需要安装reportlab (已保存为MD)"
                 except Exception as e:
-                    with open(p("md"), "w", encoding="utf-8") as f:
-                        content = markdown_text if markdown_text else text
-                        f.write(f"# {base_name}\n\n{content}")
+                    content = markdown_text if markdown_text else text
+                    _write_text(f"{base_path}.md", f"# {base_name}\n\n{content}")
                     return f"PDF导出失败: {str(e)[:30]}"
 
             # ========== PaddleOCR-VL Formats ==========
             elif "latex" in fmt or "公式" in fmt:
-                with open(p("tex"), "w", encoding="utf-8") as f:
-                    f.write(f"% {base_name}\n% LaTeX export\n\n{text}")
+                _write_text(f"{base_path}.tex", f"% {base_name}\n% LaTeX export\n\n{text}")
                 return f"已导出: {base_name}.tex"
             
             elif "语义" in fmt or "kvp" in fmt:
                 # This format was removed in favor of just "JSON" for PaddleOCR-VL
-                with open(p("json"), "w", encoding="utf-8") as f:
-                    json.dump({"file": os.path.basename(filepath), "semantic_kvp": text}, f, ensure_ascii=False, indent=2)
+                _write_text(f"{base_path}.json", json.dumps(
+                    {"file": os.path.basename(filepath), "semantic_kvp": text}, ensure_ascii=False, indent=2))
                 return f"已导出: {base_name}.json"
             
             elif "叙述" in fmt or "narrative" in fmt:
                 # This format was removed in favor of just "TXT" for PaddleOCR-VL
-                with open(p("txt"), "w", encoding="utf-8") as f:
-                    f.write(text)
+                _write_text(f"{base_path}.txt", text)
                 return f"已导出: {base_name}.txt"
             
             elif "代码" in fmt or "code" in fmt:
-                with open(p("py"), "w", encoding="utf-8") as f:
-                    f.write(f"# Extracted from {base_name}\n\n{text}")
+                _write_text(f"{base_path}.py", f"# Extracted from {base_name}\n\n{text}")
                 return f"已导出: {base_name}.py"
             
             else:
-                with open(p("txt"), "w", encoding="utf-8") as f:
-                    f.write(text)
+                _write_text(f"{base_path}.txt", text)
                 return f"已导出: {base_name}.txt"
                 
         except Exception as e:
@@ -738,7 +760,12 @@ class BatchWorker(QRunnable):
 
 class BatchProcessor:
     def __init__(self):
-        self.thread_pool = QThreadPool.globalInstance()
+        # The coordinating BatchWorker gets its own Qt pool so it never waits
+        # behind other work on the global pool; the HTTP requests themselves
+        # run on a dedicated executor sized for network concurrency rather
+        # than CPU count, and are reused across batches
+        self.thread_pool = QThreadPool()
+        self.executor = ThreadPoolExecutor(max_workers=BATCH_POOL_SIZE, thread_name_prefix="batch")
         self.current_worker = None
 
     def process(self, mode, file_list, model_override=None, output_dir=None, export_fmt=None, max_workers=5, row_indices=None):
@@ -747,15 +774,22 @@ class BatchProcessor:
         if not export_fmt:
             export_fmt = "TXT"
 
-        self.current_worker = BatchWorker(mode, file_list, model_override, output_dir, export_fmt, max_workers, row_indices)
+        self.current_worker = BatchWorker(mode, file_list, model_override, output_dir, export_fmt, max_workers, row_indices,
+                                          executor=self.executor)
         return self.current_worker
 
     def start(self, worker):
         self.thread_pool.start(worker)
 
     def stop(self):
+        # The worker cancels its queued requests; running ones finish in the background
         if self.current_worker:
             self.current_worker.stop()
 
+    def shutdown(self):
+        """Stop the current batch and drop all queued requests (call on application exit)."""
+        self.stop()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
 
 batch_processor = BatchProcessor()
@@ -1,9 +1,100 @@
 """
 Dynamic Hotkey Manager for SmartOCR
 Allows hotkeys to be updated at runtime without restart.
+
+On Windows, combinations with a modifier (e.g. Ctrl+Shift+F4) are registered
+with the OS (RegisterHotKey) and arrive as WM_HOTKEY messages, so no
+low-level hook has to inspect every keystroke. RegisterHotKey takes the key
+away from every other application, so plain keys (the default F4/F6/F9
+bindings) stay on the pass-through `keyboard` hook and keep working
+elsewhere. Combinations that cannot be mapped to a virtual key (or that
+another application already owns) and other platforms also use `keyboard`.
 """
+import logging
+import sys
 import keyboard
-from PySide6.QtCore import QObject, Signal
+from PySide6.QtCore import QObject, Signal, QAbstractNativeEventFilter, QCoreApplication
+
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+    _user32 = ctypes.windll.user32
+else:
+    _user32 = None
+
+log = logging.getLogger(__name__)
+
+WM_HOTKEY = 0x0312
+MOD_ALT = 0x0001
+MOD_CONTROL = 0x0002
+MOD_SHIFT = 0x0004
+MOD_WIN = 0x0008
+MOD_NOREPEAT = 0x4000
+
+_MODIFIERS = {
+    "ctrl": MOD_CONTROL, "control": MOD_CONTROL,
+    "shift": MOD_SHIFT,
+    "alt": MOD_ALT,
+    "win": MOD_WIN, "meta": MOD_WIN,
+}
+
+# Key names as produced by QKeySequence.toString() -> Windows virtual-key codes
+_NAMED_KEYS = {
+    "space": 0x20, "tab": 0x09, "backspace": 0x08, "return": 0x0D, "enter": 0x0D,
+    "ins": 0x2D, "insert": 0x2D, "del": 0x2E, "delete": 0x2E,
+    "home": 0x24, "end": 0x23, "pgup": 0x21, "pgdown": 0x22,
+    "print": 0x2C, "pause": 0x13,
+    "left": 0x25, "up": 0x26, "right": 0x27, "down": 0x28,
+}
+
+
+def _parse_native_hotkey(hotkey):
+    """Parse e.g. 'Ctrl+Shift+F4' into (modifiers, virtual_key), or None if unsupported."""
+    parts = [p.strip().lower() for p in hotkey.split("+")]
+    key = parts[-1]
+    if not key:
+        return None
+
+    mods = 0
+    for part in parts[:-1]:
+        if part not in _MODIFIERS:
+            return None
+        mods |= _MODIFIERS[part]
+
+    if len(key) == 1 and key.isascii() and key.isalnum():
+        vk = ord(key.upper())
+    elif key[0] == "f" and key[1:].isdigit() and 1 <= int(key[1:]) <= 24:
+        vk = 0x70 + int(key[1:]) - 1  # VK_F1 .. VK_F24
+    else:
+        vk = _NAMED_KEYS.get(key)
+        if vk is None:
+            return None
+    return mods, vk
+
+
+class _NativeHotkey:
+    """Handle for a hotkey registered through RegisterHotKey."""
+    __slots__ = ("id",)
+
+    def __init__(self, hotkey_id):
+        self.id = hotkey_id
+
+
+class _WinHotkeyFilter(QAbstractNativeEventFilter):
+    """Dispatches WM_HOTKEY messages to the registered callbacks."""
+
+    def __init__(self):
+        super().__init__()
+        self.callbacks = {}
+
+    def nativeEventFilter(self, event_type, message):
+        msg = wintypes.MSG.from_address(int(message))
+        if msg.message == WM_HOTKEY:
+            callback = self.callbacks.get(msg.wParam)
+            if callback:
+                callback()
+                return True, 0
+        return False, 0
 
 
 class HotkeyManager(QObject):
@@ -16,107 +107,99 @@ class HotkeyManager(QObject):
     
     def __init__(self):
         super().__init__()
-        self._current_screenshot_hotkey = None
-        self._current_translate_hotkey = None
-        self._current_show_main_hotkey = None
+        # Action name -> [trigger signal, current registration handle]
+        self._slots = {
+            "screenshot": [self.screenshot_triggered, None],
+            "translate": [self.translate_triggered, None],
+            "show_main": [self.show_main_triggered, None],
+        }
+        self._native_filter = None
+        self._next_native_id = 1
+
+    def _add_hotkey(self, hotkey, callback):
+        """Register a global hotkey, preferring the OS-native API. Returns a handle."""
+        handle = self._add_native_hotkey(hotkey, callback)
+        if handle is not None:
+            return handle
+        # Explicit flags: fire on press and never swallow the key, which keeps
+        # the hook on keyboard's cheapest (non-blocking) dispatch path
+        return keyboard.add_hotkey(hotkey, callback, suppress=False, trigger_on_release=False)
+
+    def _add_native_hotkey(self, hotkey, callback):
+        app = QCoreApplication.instance()
+        if _user32 is None or app is None:
+            return None
+        parsed = _parse_native_hotkey(hotkey)
+        # An unmodified key registered with the OS would stop reaching other
+        # applications; leave those to the non-suppressing hook
+        if parsed is None or not parsed[0]:
+            return None
+
+        if self._native_filter is None:
+            self._native_filter = _WinHotkeyFilter()
+            app.installNativeEventFilter(self._native_filter)
+
+        hotkey_id = self._next_native_id
+        self._next_native_id += 1
+        mods, vk = parsed
+        # Registered for the GUI thread; WM_HOTKEY is delivered to its message queue
+        if not _user32.RegisterHotKey(None, hotkey_id, mods | MOD_NOREPEAT, vk):
+            return None
+        self._native_filter.callbacks[hotkey_id] = callback
+        return _NativeHotkey(hotkey_id)
+
+    def _remove_hotkey(self, handle):
+        if isinstance(handle, _NativeHotkey):
+            _user32.UnregisterHotKey(None, handle.id)
+            self._native_filter.callbacks.pop(handle.id, None)
+        else:
+            keyboard.remove_hotkey(handle)
     
-    def register_screenshot_hotkey(self, hotkey: str):
-        """Register or update screenshot hotkey."""
+    def register(self, name, hotkey: str):
+        """Register or update the hotkey for one action ("screenshot", "translate", "show_main")."""
         if not hotkey:
             return False
-            
+        slot = self._slots[name]
+
         # Unregister old hotkey if exists
-        if self._current_screenshot_hotkey:
+        if slot[1]:
             try:
-                keyboard.remove_hotkey(self._current_screenshot_hotkey)
+                self._remove_hotkey(slot[1])
             except:
                 pass
-        
-        # Register new hotkey
+
+        # Register new hotkey; the signal's bound emit is the callback,
+        # so a key press costs no extra Python frame
         try:
-            self._current_screenshot_hotkey = keyboard.add_hotkey(
-                hotkey, 
-                lambda: self.screenshot_triggered.emit()
-            )
-            print(f"Screenshot hotkey registered: {hotkey}")
+            slot[1] = self._add_hotkey(hotkey, slot[0].emit)
+            log.debug("%s hotkey registered: %s", name, hotkey)
             return True
         except Exception as e:
-            print(f"Failed to register screenshot hotkey '{hotkey}': {e}")
-            self._current_screenshot_hotkey = None
+            log.warning("Failed to register %s hotkey %r: %s", name, hotkey, e)
+            slot[1] = None
             return False
-    
+
+    def register_screenshot_hotkey(self, hotkey: str):
+        """Register or update screenshot hotkey."""
+        return self.register("screenshot", hotkey)
+
     def register_translate_hotkey(self, hotkey: str):
         """Register or update translate hotkey."""
-        if not hotkey:
-            return False
-            
-        # Unregister old hotkey if exists
-        if self._current_translate_hotkey:
-            try:
-                keyboard.remove_hotkey(self._current_translate_hotkey)
-            except:
-                pass
-        
-        # Register new hotkey
-        try:
-            self._current_translate_hotkey = keyboard.add_hotkey(
-                hotkey, 
-                lambda: self.translate_triggered.emit()
-            )
-            print(f"Translate hotkey registered: {hotkey}")
-            return True
-        except Exception as e:
-            print(f"Failed to register translate hotkey '{hotkey}': {e}")
-            self._current_translate_hotkey = None
-            return False
-    
+        return self.register("translate", hotkey)
+
     def register_show_main_hotkey(self, hotkey: str):
         """Register or update show main window hotkey."""
-        if not hotkey:
-            return False
-            
-        # Unregister old hotkey if exists
-        if self._current_show_main_hotkey:
-            try:
-                keyboard.remove_hotkey(self._current_show_main_hotkey)
-            except:
-                pass
-        
-        # Register new hotkey
-        try:
-            self._current_show_main_hotkey = keyboard.add_hotkey(
-                hotkey, 
-                lambda: self.show_main_triggered.emit()
-            )
-            print(f"Show main window hotkey registered: {hotkey}")
-            return True
-        except Exception as e:
-            print(f"Failed to register show main hotkey '{hotkey}': {e}")
-            self._current_show_main_hotkey = None
-            return False
-    
+        return self.register("show_main", hotkey)
+
     def unregister_all(self):
         """Unregister all hotkeys."""
-        if self._current_screenshot_hotkey:
-            try:
-                keyboard.remove_hotkey(self._current_screenshot_hotkey)
-            except:
-                pass
-            self._current_screenshot_hotkey = None
-            
-        if self._current_translate_hotkey:
-            try:
-                keyboard.remove_hotkey(self._current_translate_hotkey)
-            except:
-                pass
-            self._current_translate_hotkey = None
-        
-        if self._current_show_main_hotkey:
-            try:
-                keyboard.remove_hotkey(self._current_show_main_hotkey)
-            except:
-                pass
-            self._current_show_main_hotkey = None
+        for slot in self._slots.values():
+            if slot[1]:
+                try:
+                    self._remove_hotkey(slot[1])
+                except:
+                    pass
+                slot[1] = None
 
 
 # Global singleton instance
@@ -140,8 +140,24 @@ STRINGS = {
 }
 
 class I18nManager:
+    def __init__(self):
+        # String table for the current language, resolved once per language change
+        self._lang = None
+        self._strings = None
+
+    def _table(self):
+        lang = config.view.language
+        if lang != self._lang:
+            self._strings = STRINGS.get(lang, STRINGS["zh_CN"])
+            self._lang = lang
+        return self._strings
+
     def get(self, key):
-        lang = config.get("language", "zh_CN")
-        return STRINGS.get(lang, STRINGS["zh_CN"]).get(key, key)
+        return self._table().get(key, key)
+
+    def bulk_get(self, keys):
+        """Look up several keys at once (one language check); returns {key: text}."""
+        strings = self._table()
+        return {key: strings.get(key, key) for key in keys}
 
 i18n = I18nManager()
@@ -1,29 +1,131 @@
 import requests
-import base64
+import json
 import time
+from collections.abc import Sequence
+from requests.adapters import HTTPAdapter
 from app_config import config
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# SIMD-accelerated base64 when available; same API and output as the stdlib
+try:
+    from pybase64 import b64encode
+except ImportError:
+    from base64 import b64encode
+
+
+def _dumps(obj):
+    """Compact JSON as UTF-8 bytes."""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(data):
+    """Parse a JSON response body (bytes)."""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+# Keep-alive connections kept per host; covers the batch pool (up to 20
+# workers) plus screenshot OCR so concurrent uploads never open throwaway
+# connections (requests' default pool keeps only 10)
+HTTP_POOL_SIZE = 32
+
+# Uploads at least this large are streamed with chunked transfer-encoding,
+# base64-encoding one chunk at a time instead of the whole file up front
+STREAM_UPLOAD_THRESHOLD = 4 << 20
+# Raw bytes encoded per streamed chunk (a multiple of 3, so chunk encodings
+# concatenate without inner padding)
+STREAM_CHUNK_SIZE = 3 << 14
+
+
+def _iter_body(file_data, payload_tail):
+    """Yield the JSON request body piecewise around the streamed base64 data."""
+    yield b'{"file":"'
+    for start in range(0, len(file_data), STREAM_CHUNK_SIZE):
+        yield b64encode(file_data[start:start + STREAM_CHUNK_SIZE])
+    yield b'",' + payload_tail
+
+
+# C-level predicates for filtering rec_texts lists without a Python loop:
+# keep str items, and (for _texts) only those with non-whitespace content
+_is_str = str.__instancecheck__
+
+
+def _texts(items):
+    return filter(str.strip, filter(_is_str, items))
+
+
+class _WordsView(Sequence):
+    """Read-only "words_result" list that builds {"words": line} items on access.
+
+    Callers that only need the text should use the result's "text_lines".
+    """
+    __slots__ = ("lines",)
+
+    def __init__(self, lines):
+        self.lines = lines
+
+    def __len__(self):
+        return len(self.lines)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [{"words": line} for line in self.lines[index]]
+        return {"words": self.lines[index]}
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class _ParsedResult:
+    """Pieces extracted from an OCR response."""
+    __slots__ = ("lines", "markdown_parts", "tables_html", "layout_data")
+
+    def __init__(self):
+        self.lines = []
+        self.markdown_parts = []  # Joined once at the end, not concatenated per page
+        self.tables_html = []
+        self.layout_data = []
+
+    def __bool__(self):
+        return bool(self.lines or self.markdown_parts or self.tables_html)
+
 
 class PaddleOCRClient:
     def __init__(self):
         # Use a session for connection reuse
         self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
         # Set default headers
         self._session.headers.update({
             "Content-Type": "application/json"
         })
+        # Endpoints that rejected a chunked upload; they get the buffered body
+        self._no_chunked_urls = set()
     
+    def close(self):
+        """Close pooled connections (call on application exit)."""
+        self._session.close()
+
     def ocr_image(self, image_data: bytes, model_override=None, stop_event=None, optimize_for_small=True):
         """OCR for images (fileType=1). Default optimizes for small text (screenshot mode)."""
         return self.ocr_file(image_data, file_type=1, model_override=model_override, 
                             stop_event=stop_event, optimize_for_small=optimize_for_small)
 
-    def ocr_file(self, file_data: bytes, file_type=1, model_override=None, stop_event=None, optimize_for_small=False):
+    def ocr_file(self, file_data: bytes, file_type=1, model_override=None, stop_event=None, optimize_for_small=False,
+                 include_raw=True):
         """
         OCR for any file.
+        file_data: bytes or any buffer (e.g. mmap) accepted by base64 encoding
         file_type: 0 = PDF/document, 1 = image
         stop_event: threading.Event to signal cancellation
         optimize_for_small: If True, use optimized parameters for small text (slower but more accurate)
+        include_raw: If False, omit the decoded API response ("raw_result") from the result
         """
         # Check if already stopped before starting
         if stop_event and stop_event.is_set():
@@ -38,15 +140,14 @@ class PaddleOCRClient:
         if not api_url or not token:
             return {"error": f"缺少 {current_model} 的 URL 或 Token，请在设置中配置。"}
 
-        file_b64 = base64.b64encode(file_data).decode("ascii")
-
         headers = {
             "Authorization": f"token {token}",
             "Content-Type": "application/json"
         }
 
         # Base payload - only required parameters for faster processing
-        payload = {"file": file_b64, "fileType": file_type}
+        # ("file" is spliced in separately below)
+        payload = {"fileType": file_type}
         
         # Only add optimization parameters for screenshot mode (small text detection)
         # For batch processing, use default API parameters for speed
@@ -66,6 +167,22 @@ class PaddleOCRClient:
             elif current_model == "PaddleOCR-VL":
                 payload["temperature"] = 0.1
 
+        payload_tail = _dumps(payload)[1:]
+        stream = (len(file_data) >= STREAM_UPLOAD_THRESHOLD
+                  and api_url not in self._no_chunked_urls)
+        body = None
+
+        def make_body():
+            # Large files: a fresh generator per attempt, so peak memory stays
+            # at one chunk. Otherwise build the JSON body as bytes: the base64
+            # data is copied once and never passes through the JSON encoder
+            nonlocal body
+            if stream:
+                return _iter_body(file_data, payload_tail)
+            if body is None:
+                body = b"".join((b'{"file":"', b64encode(file_data), b'",', payload_tail))
+            return body
+
         max_retries = 2
         last_error = None
         
@@ -78,36 +195,51 @@ class PaddleOCRClient:
                 # Use reasonable timeout - 10s for connect, 90s for read
                 response = self._session.post(
                     api_url, 
-                    json=payload, 
+                    data=make_body(), 
                     headers=headers, 
                     timeout=(10, 90)
                 )
 
+                # Server requires Content-Length: resend buffered, and
+                # remember not to stream to this endpoint again
+                if stream and response.status_code == 411:
+                    self._no_chunked_urls.add(api_url)
+                    stream = False
+                    response = self._session.post(
+                        api_url, data=make_body(), headers=headers, timeout=(10, 90)
+                    )
+
                 # Check stop after request
                 if stop_event and stop_event.is_set():
                     return {"error": "任务已被用户终止"}
 
                 if response.status_code != 200:
-                    return {"error": f"HTTP {response.status_code}", "raw_response": response.text[:500]}
+                    return {
+                        "error": f"HTTP {response.status_code}",
+                        "status_code": response.status_code,
+                        "raw_response": response.text[:500],
+                    }
 
-                result_json = response.json()
+                result_json = _loads(response.content)
 
                 if "errorCode" in result_json and result_json["errorCode"] != 0:
                     return {"error": f"API错误: {result_json.get('errorMsg')}", "raw_response": str(result_json)[:500]}
 
-                return self._parse_result(result_json, current_model)
+                return self._parse_result(result_json, current_model, include_raw)
 
             except requests.exceptions.Timeout as e:
                 last_error = "请求超时，请检查网络或稍后重试"
                 if attempt < max_retries:
-                    time.sleep(1)  # Wait 1 second before retry
+                    if self._retry_pause(stop_event):
+                        return {"error": "任务已被用户终止"}
                     continue
             except requests.exceptions.ConnectionError as e:
                 if stop_event and stop_event.is_set():
                     return {"error": "任务已被用户终止"}
                 last_error = f"连接错误: {str(e)[:80]}"
                 if attempt < max_retries:
-                    time.sleep(1)  # Wait 1 second before retry
+                    if self._retry_pause(stop_event):
+                        return {"error": "任务已被用户终止"}
                     continue
             except Exception as e:
                 if stop_event and stop_event.is_set():
@@ -116,14 +248,18 @@ class PaddleOCRClient:
         
         return {"error": last_error or "请求失败"}
 
-    def _parse_result(self, json_data, model_name=None):
-        """Parse API response for all model types."""
-        res = json_data.get("result", {})
-        all_lines = []
-        markdown_text = ""
-        tables_html = []  # List of HTML tables from PP-StructureV3
-        layout_data = []
+    @staticmethod
+    def _retry_pause(stop_event):
+        """Wait 1 second before a retry; returns True if stopped meanwhile."""
+        if stop_event:
+            return stop_event.wait(1.0)
+        time.sleep(1)
+        return False
 
+    # ---------- Response parsing ----------
+    # Each collector extracts one response schema into a _ParsedResult.
+
+    def _collect_layout_parsing(self, res, out):
         # ========== PP-StructureV3 Format ==========
         # Returns layoutParsingResults with markdown.text and table_res_list
         if "layoutParsingResults" in res and isinstance(res["layoutParsingResults"], list):
@@ -132,24 +268,24 @@ class PaddleOCRClient:
                 if "markdown" in item and isinstance(item["markdown"], dict):
                     md_text = item["markdown"].get("text", "")
                     if md_text:
-                        markdown_text += md_text + "\n\n"
+                        out.markdown_parts.append(md_text)
                 
                 # Get table HTML from table_res_list (key for Excel export)
                 if "table_res_list" in item and isinstance(item["table_res_list"], list):
                     for table in item["table_res_list"]:
                         if "pred_html" in table:
-                            tables_html.append(table["pred_html"])
+                            out.tables_html.append(table["pred_html"])
                 
                 # Get prunedResult text
                 if "prunedResult" in item:
                     pr = item["prunedResult"]
                     if isinstance(pr, str):
-                        all_lines.append(pr)
+                        out.lines.append(pr)
                     elif isinstance(pr, dict):
                         if "text" in pr:
-                            all_lines.append(pr["text"])
+                            out.lines.append(pr["text"])
                         if "rec_texts" in pr:
-                            all_lines.extend([t for t in pr["rec_texts"] if isinstance(t, str)])
+                            out.lines.extend(filter(_is_str, pr["rec_texts"]))
                 
                 # Get parsing_res_list for layout data
                 if "parsing_res_list" in item:
@@ -157,47 +293,76 @@ class PaddleOCRClient:
                         block_content = block.get("block_content", "")
                         block_label = block.get("block_label", "text")
                         if block_content:
-                            layout_data.append({
+                            out.layout_data.append({
                                 "label": block_label,
                                 "content": block_content,
                                 "bbox": block.get("block_bbox"),
                                 "order": block.get("block_order")
                             })
                             if block_label != "table":  # Avoid duplicating table content
-                                all_lines.append(block_content)
+                                out.lines.append(block_content)
 
+    def _collect_ocr_results(self, res, out):
         # ========== PP-OCRv5 Format ==========
         if "ocrResults" in res and isinstance(res["ocrResults"], list):
             for ocr_item in res["ocrResults"]:
                 if "prunedResult" in ocr_item:
                     pr = ocr_item["prunedResult"]
                     if isinstance(pr, str):
-                        all_lines.append(pr)
+                        out.lines.append(pr)
                     elif isinstance(pr, dict) and "rec_texts" in pr:
-                        all_lines.extend([t for t in pr["rec_texts"] if isinstance(t, str)])
+                        out.lines.extend(filter(_is_str, pr["rec_texts"]))
                 
                 if "rec_texts" in ocr_item and isinstance(ocr_item["rec_texts"], list):
-                    for text in ocr_item["rec_texts"]:
-                        if isinstance(text, str) and text.strip():
-                            all_lines.append(text)
+                    out.lines.extend(_texts(ocr_item["rec_texts"]))
 
+    def _collect_rec_texts(self, res, out):
         # ========== Fallback: rec_texts at result level ==========
-        if not all_lines and "rec_texts" in res:
+        if not out.lines and "rec_texts" in res:
             if isinstance(res["rec_texts"], list):
-                for text in res["rec_texts"]:
-                    if isinstance(text, str) and text.strip():
-                        all_lines.append(text)
+                out.lines.extend(_texts(res["rec_texts"]))
 
+    def _collect_structure_results(self, res, out):
         # ========== PaddleOCR-VL Format ==========
-        if not all_lines and "structureResults" in res:
+        if not out.lines and "structureResults" in res:
             for item in res["structureResults"]:
                 if "rec_texts" in item and isinstance(item["rec_texts"], list):
-                    all_lines.extend([t for t in item["rec_texts"] if isinstance(t, str)])
+                    out.lines.extend(filter(_is_str, item["rec_texts"]))
+
+    # Schemas each model is expected to return, in order
+    _MODEL_COLLECTORS = {
+        "PP-StructureV3": (_collect_layout_parsing,),
+        "PP-OCRv5": (_collect_ocr_results, _collect_rec_texts),
+        "PaddleOCR-VL": (_collect_layout_parsing, _collect_structure_results),
+    }
+    # Unknown model, or the expected schema yielded nothing: try every format
+    _GENERIC_COLLECTORS = (_collect_layout_parsing, _collect_ocr_results,
+                           _collect_rec_texts, _collect_structure_results)
+
+    def _parse_result(self, json_data, model_name=None, include_raw=True):
+        """Parse API response for all model types."""
+        res = json_data.get("result", {})
+
+        out = _ParsedResult()
+        for collect in self._MODEL_COLLECTORS.get(model_name, ()):
+            collect(self, res, out)
+        if not out:
+            out = _ParsedResult()
+            for collect in self._GENERIC_COLLECTORS:
+                collect(self, res, out)
+
+        all_lines = out.lines
+        # Each page's markdown is followed by a blank line
+        parts = out.markdown_parts
+        markdown_text = "\n\n".join(parts) + "\n\n" if parts else ""
+        tables_html = out.tables_html  # List of HTML tables from PP-StructureV3
+        layout_data = out.layout_data
 
         # Build result
         if not all_lines and not markdown_text and not tables_html:
             return {
-                "words_result": [], 
+                "text_lines": [],
+                "words_result": _WordsView([]),
                 "markdown": "",
                 "tables_html": [],
                 "layout_data": [],
@@ -211,12 +376,14 @@ class PaddleOCRClient:
         else:
             final_text = "\n".join(all_lines)
 
+        text_lines = all_lines if all_lines else [final_text]
         return {
-            "words_result": [{"words": line} for line in all_lines] if all_lines else [{"words": final_text}],
+            "text_lines": text_lines,  # Plain list of recognized lines
+            "words_result": _WordsView(text_lines),
             "markdown": markdown_text,
             "tables_html": tables_html,  # HTML tables for Excel export
             "layout_data": layout_data,
-            "raw_result": res
+            "raw_result": res if include_raw else None
         }
 
 
@@ -1,41 +1,114 @@
+import json
 import requests
 from app_config import config
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def split_text(text, max_chars=2000):
+    """
+    Split text into chunks of roughly max_chars for separate translation requests.
+    Breaks at blank lines where possible, and at line ends inside oversized paragraphs.
+    """
+    if len(text) <= max_chars:
+        return [text]
+
+    chunks = []
+    current = ""
+    for para in text.split("\n\n"):
+        lines = para.split("\n") if len(para) > max_chars else [para]
+        for i, line in enumerate(lines):
+            sep = "\n" if i else "\n\n"
+            if current and len(current) + len(sep) + len(line) > max_chars:
+                chunks.append(current)
+                current = line
+            elif current:
+                current += sep + line
+            else:
+                current = line
+    if current:
+        chunks.append(current)
+    return chunks
+
 class TranslatorService:
+    def __init__(self):
+        # (custom_prompts list, {mode: template}, {(mode, lang): rendered prompts}).
+        # Rebuilt whenever config.set("translation", ...) installs a new list;
+        # swapped as one tuple so concurrent chunk translations stay consistent.
+        self._prompt_cache = None
+        # (translation config dict, request URL, headers, model); same invalidation
+        self._endpoint_cache = None
+
+    def _get_endpoint(self, trans_cfg):
+        """Return (req_url, headers, model) for a translation config; req_url is None if unset."""
+        cache = self._endpoint_cache
+        if cache is None or cache[0] is not trans_cfg:
+            req_url = trans_cfg.get("api_url") or None
+            # Auto-append endpoint if missing (simple heuristic)
+            if req_url and "chat/completions" not in req_url:
+                if req_url.endswith("/"):
+                    req_url += "v1/chat/completions"
+                else:
+                    req_url += "/v1/chat/completions"
+
+            headers = {
+                "Authorization": f"Bearer {trans_cfg.get('api_key')}",
+                "Content-Type": "application/json"
+            }
+            cache = self._endpoint_cache = (trans_cfg, req_url, headers, trans_cfg.get("model"))
+        return cache[1:]
+
+    def _get_prompts(self, prompts, mode_name, target_lang):
+        """Return (system_prompt, user_prompt_prefix) for a mode, or None if the mode is unknown."""
+        cache = self._prompt_cache
+        if cache is None or cache[0] is not prompts:
+            templates = {}
+            for p in prompts:
+                templates.setdefault(p["mode"], p)  # First match wins, as before
+            cache = self._prompt_cache = (prompts, templates, {})
+        _, templates, rendered = cache
+
+        key = (mode_name, target_lang)
+        result = rendered.get(key)
+        if result is None:
+            template = templates.get(mode_name)
+            if not template:
+                return None
+
+            # Replace placeholders
+            # We replace `${tolang}` AND `target_lang` to be safe/compatible with user prompt style
+            sys_prompt = template.get("system_prompt", "")
+            sys_prompt = sys_prompt.replace("${tolang}", target_lang).replace("target_lang", target_lang)
+
+            user_prompt_prefix = template.get("prompt", "")
+            user_prompt_prefix = user_prompt_prefix.replace("${tolang}", target_lang).replace("target_lang", target_lang)
+
+            result = rendered[key] = (sys_prompt, user_prompt_prefix)
+        return result
+
     def translate(self, text, mode_name="文本翻译", target_lang="中文"):
         """
         Translates text using a custom AI Model, specific Prompt Mode, and Target Language.
         """
         trans_cfg = config.get("translation", {})
-        api_url = trans_cfg.get("api_url")
-        api_key = trans_cfg.get("api_key")
-        model = trans_cfg.get("model")
+        req_url, headers, model = self._get_endpoint(trans_cfg)
         
-        if not api_url:
+        if not req_url:
             return f"[Error]: Translation API URL not configured in Settings."
 
-        # Find the prompt template
-        prompts = trans_cfg.get("custom_prompts", [])
-        template = next((p for p in prompts if p["mode"] == mode_name), None)
+        # Find the (cached, already rendered) prompt template
+        rendered = self._get_prompts(trans_cfg.get("custom_prompts", []), mode_name, target_lang)
         
-        if not template:
+        if not rendered:
             return f"[Error]: Mode '{mode_name}' not found."
 
-        # Replace placeholders
-        # We replace `${tolang}` AND `target_lang` to be safe/compatible with user prompt style
-        sys_prompt = template.get("system_prompt", "")
-        sys_prompt = sys_prompt.replace("${tolang}", target_lang).replace("target_lang", target_lang)
-        
-        user_prompt_prefix = template.get("prompt", "")
-        user_prompt_prefix = user_prompt_prefix.replace("${tolang}", target_lang).replace("target_lang", target_lang)
+        sys_prompt, user_prompt_prefix = rendered
         
         final_user_content = f"{user_prompt_prefix}\n{text}"
 
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
-        
         payload = {
             "model": model,
             "messages": [
@@ -46,18 +119,11 @@ class TranslatorService:
         }
         
         try:
-            req_url = api_url
-            # Auto-append endpoint if missing (simple heuristic)
-            if "chat/completions" not in req_url:
-                if req_url.endswith("/"):
-                    req_url += "v1/chat/completions"
-                else:
-                    req_url += "/v1/chat/completions"
-                
-            resp = requests.post(req_url, json=payload, headers=headers, timeout=60)
+            body = orjson.dumps(payload) if orjson else json.dumps(payload).encode("utf-8")
+            resp = requests.post(req_url, data=body, headers=headers, timeout=60)
             
             if resp.status_code == 200:
-                data = resp.json()
+                data = orjson.loads(resp.content) if orjson else resp.json()
                 if "choices" in data and len(data["choices"]) > 0:
                     return data['choices'][0]['message']['content']
                 else:
@@ -0,0 +1,28 @@
+import unittest
+
+from app_config import DEFAULT_CONFIG, _thaw
+
+
+class DefaultConfigTest(unittest.TestCase):
+    def test_top_level_is_read_only(self):
+        with self.assertRaises(TypeError):
+            DEFAULT_CONFIG["current_model"] = "PP-OCRv5"
+
+    def test_nested_values_are_read_only(self):
+        with self.assertRaises(TypeError):
+            DEFAULT_CONFIG["models"]["PP-OCRv5"]["url"] = "http://example.com"
+        with self.assertRaises(TypeError):
+            DEFAULT_CONFIG["batch"]["images"]["formats"][0] = "txt"
+        with self.assertRaises(AttributeError):
+            DEFAULT_CONFIG["translation"]["custom_prompts"].append({})
+
+    def test_thawed_copy_is_independent(self):
+        data = _thaw(DEFAULT_CONFIG)
+        data["models"]["PP-OCRv5"]["url"] = "http://example.com"
+        data["translation"]["custom_prompts"].clear()
+        self.assertEqual(DEFAULT_CONFIG["models"]["PP-OCRv5"]["url"], "")
+        self.assertEqual(len(DEFAULT_CONFIG["translation"]["custom_prompts"]), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
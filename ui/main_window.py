@@ -1,14 +1,14 @@
 import sys
 import os
+import re
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
     QFileDialog, QTabWidget, QLabel, QComboBox, QMessageBox,
-    QTableWidget, QTableWidgetItem, QProgressBar, QHeaderView, QApplication,
+    QTableView, QStyledItemDelegate, QStyleOptionProgressBar, QStyle, QHeaderView, QApplication,
     QLineEdit, QAbstractItemView, QMenu
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QAbstractTableModel, QModelIndex, QTimer
 from PySide6.QtGui import QDragEnterEvent, QDropEvent
-from ui.settings_dialog import SettingsDialog
 from services.i18n import i18n
 from app_config import config
 
@@ -20,26 +20,224 @@ MODEL_FORMATS = {
     "PaddleOCR-VL": ["Markdown", "LaTeX公式", "JSON", "TXT", "代码"]
 }
 
-# Model-specific accepted file extensions
+# Model-specific accepted file extensions (sets: checked once per dropped file)
 MODEL_FILE_EXTS = {
-    "PP-OCRv5": ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif', '.pdf'],
-    "PP-StructureV3": ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif', '.pdf'],
-    "PaddleOCR-VL": ['.jpg', '.jpeg', '.png', '.bmp', '.webp']
+    "PP-OCRv5": frozenset({'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif', '.pdf'}),
+    "PP-StructureV3": frozenset({'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif', '.pdf'}),
+    "PaddleOCR-VL": frozenset({'.jpg', '.jpeg', '.png', '.bmp', '.webp'})
 }
 
 
-class DropTableWidget(QTableWidget):
-    """Table widget that accepts drag-drop files"""
+# Height (px) of every row in the batch file tables
+TABLE_ROW_HEIGHT = 22
+
+# Result-text classification, compiled once: each row is tested with a
+# set lookup (exact texts) or a single regex search (substring markers)
+_PROCESSING = frozenset(("处理中...", "Processing..."))
+_UNFINISHED = _PROCESSING | {"待处理", "Pending"}
+_SUCCESS_PATTERNS = ("成功", "已导出", "Success", "Exported")
+_COMPLETED_PATTERNS = ("成功", "完成", "已导出", "无内容")
+_SUCCESS_RE = re.compile("|".join(map(re.escape, _SUCCESS_PATTERNS)))
+_COMPLETED_RE = re.compile("|".join(map(re.escape, _COMPLETED_PATTERNS)))
+
+# Interval (ms) at which queued batch progress/status updates reach the table
+UPDATE_INTERVAL_MS = 50
+
+# Role holding a row's progress (0-100) in the progress column
+PROGRESS_ROLE = Qt.UserRole + 1
+
+
+class BatchFilesModel(QAbstractTableModel):
+    """Batch file list: file path, progress and result text per row.
+
+    Columns are kept as flat per-column lists, so a row costs three list
+    slots instead of a QTableWidgetItem per cell plus a progress widget.
+    """
+    COL_FILE, COL_PROGRESS, COL_RESULT = range(3)
+
+    def __init__(self, headers, parent=None):
+        super().__init__(parent)
+        self._headers = headers
+        self._paths = []
+        self._progress = []
+        self._status = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._paths)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 3
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if col == self.COL_FILE:
+            if role in (Qt.DisplayRole, Qt.EditRole, Qt.UserRole):
+                return self._paths[row]
+        elif col == self.COL_PROGRESS:
+            if role == PROGRESS_ROLE:
+                return self._progress[row]
+        elif role in (Qt.DisplayRole, Qt.EditRole):
+            return self._status[row]
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid():
+            return False
+        row, col = index.row(), index.column()
+        if col == self.COL_PROGRESS and role == PROGRESS_ROLE:
+            self._progress[row] = value
+        elif col == self.COL_RESULT and role == Qt.EditRole:
+            self._status[row] = value
+        else:
+            return False
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def flags(self, index):
+        flags = super().flags(index)
+        # Result text stays editable so error details can be selected and copied
+        if index.column() == self.COL_RESULT:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self._headers[section]
+        return super().headerData(section, orientation, role)
+
+    def add_paths(self, paths):
+        """Append rows for the given files in a single insert."""
+        if not paths:
+            return
+        first = len(self._paths)
+        self.beginInsertRows(QModelIndex(), first, first + len(paths) - 1)
+        self._paths.extend(paths)
+        self._progress.extend([0] * len(paths))
+        self._status.extend([i18n.get("status_pending")] * len(paths))
+        self.endInsertRows()
+
+    def remove_rows(self, rows):
+        """Remove the given row numbers, one removal per contiguous range."""
+        ranges = []
+        for row in sorted(set(rows)):
+            if ranges and ranges[-1][1] == row - 1:
+                ranges[-1][1] = row
+            else:
+                ranges.append([row, row])
+        # Bottom-up, so earlier ranges keep their row numbers
+        for first, last in reversed(ranges):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._paths[first:last + 1]
+            del self._progress[first:last + 1]
+            del self._status[first:last + 1]
+            self.endRemoveRows()
+
+    def clear_completed(self, completed_re=None):
+        """Remove rows whose result text matches the completed-status regex."""
+        search = (completed_re or _COMPLETED_RE).search
+        self.remove_rows([row for row, text in enumerate(self._status) if search(text)])
+
+    def clear(self):
+        self.beginResetModel()
+        self._paths.clear()
+        self._progress.clear()
+        self._status.clear()
+        self.endResetModel()
+
+    def collect_pending(self):
+        """Reset every row not yet exported successfully and return its work.
+
+        Returns (paths, rows) for the rows to process; their progress and
+        result text are reset in place with a single dataChanged.
+        """
+        is_success = _SUCCESS_RE.search
+        rows = [row for row, text in enumerate(self._status) if not is_success(text)]
+        if not rows:
+            return [], []
+        pending_text = i18n.get("status_pending")
+        for row in rows:
+            self._progress[row] = 0
+            self._status[row] = pending_text
+        self.dataChanged.emit(self.index(rows[0], self.COL_PROGRESS), self.index(rows[-1], self.COL_RESULT))
+        return [self._paths[row] for row in rows], rows
+
+    def any_processing(self):
+        """True if any row is still being processed."""
+        return any(status in _PROCESSING for status in self._status)
+
+    def path(self, row):
+        return self._paths[row]
+
+    def status(self, row):
+        return self._status[row]
+
+    def apply_updates(self, progress, status):
+        """Apply queued {row: value} progress and status updates.
+
+        Emits one dataChanged per column spanning the touched rows, instead
+        of one signal (and repaint) per update.
+        """
+        count = len(self._paths)
+        for column, values, target, role in (
+            (self.COL_PROGRESS, progress, self._progress, PROGRESS_ROLE),
+            (self.COL_RESULT, status, self._status, Qt.DisplayRole),
+        ):
+            # Rows deleted while the batch was running are dropped
+            rows = [row for row in values if row < count]
+            if not rows:
+                continue
+            for row in rows:
+                target[row] = values[row]
+            self.dataChanged.emit(self.index(min(rows), column), self.index(max(rows), column), [role])
+
+    def set_progress(self, row, value):
+        self.setData(self.index(row, self.COL_PROGRESS), value, PROGRESS_ROLE)
+
+    def set_status(self, row, text):
+        self.setData(self.index(row, self.COL_RESULT), text)
+
+
+class ProgressDelegate(QStyledItemDelegate):
+    """Paints the progress column as a progress bar, without a widget per row."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # One style option reused for every cell; only per-row fields change
+        self._opt = QStyleOptionProgressBar()
+        self._opt.minimum = 0
+        self._opt.maximum = 100
+        self._opt.textVisible = True
+
+    def paint(self, painter, option, index):
+        progress = index.data(PROGRESS_ROLE) or 0
+        opt = self._opt
+        opt.rect = option.rect
+        opt.state = option.state
+        opt.progress = progress
+        opt.text = f"{progress}%"
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.CE_ProgressBar, opt, painter, option.widget)
+
+
+class DropTableView(QTableView):
+    """Table view that accepts drag-drop files"""
     files_dropped = Signal(list)
     
     def __init__(self, accepted_extensions):
         super().__init__()
-        self.accepted_extensions = accepted_extensions
+        self.accepted_extensions = frozenset(accepted_extensions)
         self.setAcceptDrops(True)
         self.setDragDropMode(QAbstractItemView.DropOnly)
+        # Uniform fixed-height rows: Qt never asks each row for its size hint,
+        # so inserting or scrolling thousands of rows needs no per-row layout
+        rows = self.verticalHeader()
+        rows.setSectionResizeMode(QHeaderView.Fixed)
+        rows.setDefaultSectionSize(TABLE_ROW_HEIGHT)
     
     def update_accepted_extensions(self, exts):
-        self.accepted_extensions = exts
+        self.accepted_extensions = frozenset(exts)
     
     def dragEnterEvent(self, event: QDragEnterEvent):
         if event.mimeData().hasUrls():
@@ -51,18 +249,26 @@ class DropTableWidget(QTableWidget):
         if event.mimeData().hasUrls():
             event.acceptProposedAction()
     
+    def _is_accepted(self, name):
+        dot = name.rfind('.')
+        return dot >= 0 and name[dot:].lower() in self.accepted_extensions
+
     def dropEvent(self, event: QDropEvent):
         files = []
         for url in event.mimeData().urls():
             path = url.toLocalFile()
-            ext = os.path.splitext(path)[1].lower()
-            if ext in self.accepted_extensions:
+            if os.path.isdir(path):
+                # Dropped folder: add its supported files (not recursive)
+                with os.scandir(path) as entries:
+                    files.extend(entry.path for entry in entries
+                                 if self._is_accepted(entry.name) and entry.is_file())
+            elif self._is_accepted(path):
                 files.append(path)
         if files:
             self.files_dropped.emit(files)
             event.acceptProposedAction()
         else:
-            QMessageBox.warning(self, "格式不支持", f"当前模型不支持此文件格式。\n支持的格式: {', '.join(self.accepted_extensions)}")
+            QMessageBox.warning(self, "格式不支持", f"当前模型不支持此文件格式。\n支持的格式: {', '.join(sorted(self.accepted_extensions))}")
 
     def contextMenuEvent(self, event):
         """Override context menu to show Chinese options"""
@@ -71,18 +277,17 @@ class DropTableWidget(QTableWidget):
         action_delete = menu.addAction("删除")
         action_clear = menu.addAction("清空全部")
         
+        model = self.model()
         action = menu.exec_(self.mapToGlobal(event.pos()))
         if action == action_copy:
-            items = self.selectedItems()
-            if items:
-                text = "\n".join([item.text() for item in items])
-                QApplication.clipboard().setText(text)
+            texts = [index.data() for index in self.selectedIndexes()]
+            texts = [text for text in texts if text is not None]
+            if texts:
+                QApplication.clipboard().setText("\n".join(texts))
         elif action == action_delete:
-            rows = set(item.row() for item in self.selectedItems())
-            for row in sorted(rows, reverse=True):
-                self.removeRow(row)
+            model.remove_rows(index.row() for index in self.selectedIndexes())
         elif action == action_clear:
-            self.setRowCount(0)
+            model.clear()
 
 
 class MainWindow(QMainWindow):
@@ -90,6 +295,14 @@ class MainWindow(QMainWindow):
 
     def __init__(self):
         super().__init__()
+        self.settings_dialog = None  # Currently open SettingsDialog, if any
+        # Batch progress/status updates are queued per row and applied to the
+        # table in one step every UPDATE_INTERVAL_MS while a batch runs
+        self._pending_progress = {}
+        self._pending_status = {}
+        self._update_timer = QTimer(self)
+        self._update_timer.setInterval(UPDATE_INTERVAL_MS)
+        self._update_timer.timeout.connect(self._flush_item_updates)
         self.update_ui_text()
         # Default window size: filename column (600) + progress column (150) + result column (200) + borders (50)
         self.resize(1000, 700)
@@ -158,29 +371,16 @@ class MainWindow(QMainWindow):
             # User confirmed, stop the task first
             from services.batch_processor import batch_processor
             batch_processor.stop()
-        
-        # Force exit the entire process to ensure no threads remain
-        import os
+
+        # run_app's aboutToQuit handler releases hotkeys and worker threads,
+        # flushes pending config changes and ends the process without
+        # waiting out in-flight requests
         QApplication.quit()
-        os._exit(0)  # Force exit to kill all threads
     
     def _has_processing_items(self):
         """Check if any items in the tables are currently being processed."""
-        processing_texts = ["处理中...", "Processing..."]
-        
-        # Check images table
-        for row in range(self.table_images.rowCount()):
-            result_item = self.table_images.item(row, 2)  # Result column
-            if result_item and result_item.text() in processing_texts:
-                return True
-        
-        # Check docs table
-        for row in range(self.table_docs.rowCount()):
-            result_item = self.table_docs.item(row, 2)  # Result column
-            if result_item and result_item.text() in processing_texts:
-                return True
-        
-        return False
+        self._flush_item_updates()
+        return self.model_images.any_processing() or self.model_docs.any_processing()
 
     def update_ui_text(self):
         self.setWindowTitle(i18n.get("app_title"))
@@ -239,11 +439,12 @@ class MainWindow(QMainWindow):
         layout.addLayout(top_bar)
 
         # Drag-drop table with model-specific extensions
-        self.table_images = DropTableWidget(MODEL_FILE_EXTS["PP-OCRv5"])
-        self.table_images.setColumnCount(3)
-        self.table_images.setHorizontalHeaderLabels([
+        self.table_images = DropTableView(MODEL_FILE_EXTS["PP-OCRv5"])
+        self.model_images = BatchFilesModel([
             i18n.get("col_filename"), i18n.get("col_progress"), i18n.get("col_result")
-        ])
+        ], self)
+        self.table_images.setModel(self.model_images)
+        self.table_images.setItemDelegateForColumn(BatchFilesModel.COL_PROGRESS, ProgressDelegate(self.table_images))
         # Make all columns resizable
         self.table_images.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
         self.table_images.setColumnWidth(0, 600)  # Filename column
@@ -255,7 +456,7 @@ class MainWindow(QMainWindow):
         btn_add = QPushButton(i18n.get("btn_add_images"))
         btn_add.clicked.connect(lambda: self.add_files_for_model(self.combo_model_img.currentText(), self.table_images))
         btn_clear = QPushButton(i18n.get("btn_clear"))
-        btn_clear.clicked.connect(lambda: self.table_images.setRowCount(0))
+        btn_clear.clicked.connect(self.model_images.clear)
         btn_clear_done = QPushButton("清空已完成")
         btn_clear_done.clicked.connect(lambda: self.clear_completed_rows(self.table_images))
         btn_layout.addWidget(btn_add)
@@ -268,11 +469,11 @@ class MainWindow(QMainWindow):
 
     def on_img_model_changed(self, model_name):
         self.update_format_combo(self.combo_format_img, model_name)
-        self.table_images.update_accepted_extensions(MODEL_FILE_EXTS.get(model_name, []))
+        self.table_images.update_accepted_extensions(MODEL_FILE_EXTS.get(model_name, ()))
 
     def on_doc_model_changed(self, model_name):
         self.update_format_combo(self.combo_format_doc, model_name)
-        self.table_docs.update_accepted_extensions(MODEL_FILE_EXTS.get(model_name, []))
+        self.table_docs.update_accepted_extensions(MODEL_FILE_EXTS.get(model_name, ()))
 
     def update_format_combo(self, combo, model_name):
         combo.clear()
@@ -328,11 +529,12 @@ class MainWindow(QMainWindow):
         layout.addLayout(top_bar)
 
         # Drag-drop table with model-specific extensions
-        self.table_docs = DropTableWidget(MODEL_FILE_EXTS["PP-StructureV3"])
-        self.table_docs.setColumnCount(3)
-        self.table_docs.setHorizontalHeaderLabels([
+        self.table_docs = DropTableView(MODEL_FILE_EXTS["PP-StructureV3"])
+        self.model_docs = BatchFilesModel([
             i18n.get("col_filename"), i18n.get("col_progress"), i18n.get("col_result")
-        ])
+        ], self)
+        self.table_docs.setModel(self.model_docs)
+        self.table_docs.setItemDelegateForColumn(BatchFilesModel.COL_PROGRESS, ProgressDelegate(self.table_docs))
         # Make all columns resizable
         self.table_docs.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
         self.table_docs.setColumnWidth(0, 600)  # Filename column
@@ -344,7 +546,7 @@ class MainWindow(QMainWindow):
         btn_add = QPushButton(i18n.get("btn_add_docs"))
         btn_add.clicked.connect(lambda: self.add_files_for_model(self.combo_model_doc.currentText(), self.table_docs))
         btn_clear = QPushButton(i18n.get("btn_clear"))
-        btn_clear.clicked.connect(lambda: self.table_docs.setRowCount(0))
+        btn_clear.clicked.connect(self.model_docs.clear)
         btn_clear_done = QPushButton("清空已完成")
         btn_clear_done.clicked.connect(lambda: self.clear_completed_rows(self.table_docs))
         btn_layout.addWidget(btn_add)
@@ -356,8 +558,8 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.table_docs)
 
     def add_files_for_model(self, model_name, table_widget):
-        exts = MODEL_FILE_EXTS.get(model_name, ['.jpg', '.png'])
-        ext_list = ' '.join([f'*{e}' for e in exts])
+        exts = MODEL_FILE_EXTS.get(model_name, ('.jpg', '.png'))
+        ext_list = ' '.join([f'*{e}' for e in sorted(exts)])
         filter_str = f"支持的文件 ({ext_list})"
         files, _ = QFileDialog.getOpenFileNames(self, "选择文件", "", filter_str)
         if files:
@@ -377,39 +579,10 @@ class MainWindow(QMainWindow):
 
     def clear_completed_rows(self, table_widget):
         """Remove rows where result column shows completion status"""
-        completed_statuses = ["成功", "完成", "已导出", "无内容"]
-        rows_to_remove = []
-        
-        for row in range(table_widget.rowCount()):
-            result_item = table_widget.item(row, 2)
-            if result_item:
-                text = result_item.text()
-                if any(status in text for status in completed_statuses):
-                    rows_to_remove.append(row)
-        
-        # Remove from bottom to top
-        for row in reversed(rows_to_remove):
-            table_widget.removeRow(row)
+        table_widget.model().clear_completed(_COMPLETED_RE)
 
     def add_files_to_table(self, files, table_widget):
-        for f in files:
-            row = table_widget.rowCount()
-            table_widget.insertRow(row)
-
-            # File path - editable
-            name_item = QTableWidgetItem(f)
-            name_item.setData(Qt.UserRole, f)
-            table_widget.setItem(row, 0, name_item)
-
-            # Progress bar
-            pbar = QProgressBar()
-            pbar.setRange(0, 100)
-            pbar.setValue(0)
-            table_widget.setCellWidget(row, 1, pbar)
-
-            # Result - EDITABLE for copying error info
-            result_item = QTableWidgetItem(i18n.get("status_pending"))
-            table_widget.setItem(row, 2, result_item)
+        table_widget.model().add_paths(files)
 
     def add_files(self, filter_str, table_widget):
         files, _ = QFileDialog.getOpenFileNames(self, "选择文件", "", filter_str)
@@ -417,11 +590,19 @@ class MainWindow(QMainWindow):
             self.add_files_to_table(files, table_widget)
 
     def open_settings(self):
+        # Only one settings dialog at a time; bring an existing one to front
+        if self.settings_dialog:
+            self.settings_dialog.raise_()
+            self.settings_dialog.activateWindow()
+            return
         try:
-            dialog = SettingsDialog(self)
-            dialog.exec()
+            from ui.settings_dialog import SettingsDialog
+            self.settings_dialog = SettingsDialog(self)
+            self.settings_dialog.exec()
         except Exception as e:
             QMessageBox.critical(self, i18n.get("msg_error"), str(e))
+        finally:
+            self.settings_dialog = None
 
     def start_batch_processing(self):
         idx = self.tabs.currentIndex()
@@ -441,37 +622,15 @@ class MainWindow(QMainWindow):
             export_fmt = self.combo_format_doc.currentText()
             max_workers = int(self.combo_workers_doc.currentText())
 
-        row_count = target_table.rowCount()
+        target_model = target_table.model()
+        row_count = target_model.rowCount()
         if row_count == 0:
             QMessageBox.warning(self, i18n.get("msg_error"), i18n.get("msg_no_files"))
             return
 
-        # Collect files and their row indices, skipping already successful tasks
-        files = []
-        row_indices = []  # Track original row indices for status updates
-        
-        # Status patterns that indicate successful completion (skip these)
-        success_patterns = ["成功", "已导出", "Success", "Exported"]
-        
-        for r in range(row_count):
-            result_item = target_table.item(r, 2)
-            result_text = result_item.text() if result_item else ""
-            
-            # Check if this task was already successfully completed
-            is_already_done = any(pattern in result_text for pattern in success_patterns)
-            
-            if is_already_done:
-                # Skip this task, it's already done
-                continue
-            
-            # Add this task to the processing list
-            item = target_table.item(r, 0)
-            files.append(item.data(Qt.UserRole) or item.text())
-            row_indices.append(r)
-            
-            # Reset progress and status for this task
-            target_table.cellWidget(r, 1).setValue(0)
-            target_table.setItem(r, 2, QTableWidgetItem(i18n.get("status_pending")))
+        # Collect files and their row indices (for status updates), skipping
+        # already successful tasks; the rest are reset to pending
+        files, row_indices = target_model.collect_pending()
 
         # Check if there are any tasks to process
         if not files:
@@ -482,7 +641,7 @@ class MainWindow(QMainWindow):
         self.btn_stop.setEnabled(True)
         self.btn_start.setText(i18n.get("status_processing"))
 
-        self.current_table = target_table
+        self.current_model = target_model
         self.current_row_indices = row_indices  # Store for status updates
 
         from services.batch_processor import batch_processor
@@ -492,9 +651,11 @@ class MainWindow(QMainWindow):
         worker.signals.progress_update.connect(self.on_item_progress)
         worker.signals.status_update.connect(self.on_item_status)
         worker.signals.result_update.connect(self.on_item_result)
+        worker.signals.completed.connect(self.on_item_completed)
         worker.signals.finished.connect(self.on_batch_finished)
         worker.signals.stopped.connect(self.on_batch_stopped)
 
+        self._update_timer.start()
         batch_processor.start(worker)
 
     def stop_batch_processing(self):
@@ -505,31 +666,46 @@ class MainWindow(QMainWindow):
         self.btn_start.setText(i18n.get("btn_restart"))
 
     def on_item_progress(self, row, current, total):
-        pbar = self.current_table.cellWidget(row, 1)
-        if pbar:
-            pbar.setValue(current)
+        self._pending_progress[row] = current
 
     def on_item_status(self, row, status_text):
-        self.current_table.setItem(row, 2, QTableWidgetItem(status_text))
+        self._pending_status[row] = status_text
 
     def on_item_result(self, row, text):
-        self.current_table.setItem(row, 2, QTableWidgetItem(text))
+        self._pending_status[row] = text
+
+    def on_item_completed(self, row, status_text, current, total, text):
+        """Final update for a row: one queued signal instead of three."""
+        self._pending_progress[row] = current
+        self._pending_status[row] = text
+
+    def _flush_item_updates(self):
+        """Apply queued row updates to the current batch's table."""
+        if not (self._pending_progress or self._pending_status):
+            return
+        progress, self._pending_progress = self._pending_progress, {}
+        status, self._pending_status = self._pending_status, {}
+        self.current_model.apply_updates(progress, status)
+
+    def _end_item_updates(self):
+        self._update_timer.stop()
+        self._flush_item_updates()
 
     def on_batch_finished(self):
+        self._end_item_updates()
         self.reset_buttons()
         QMessageBox.information(self, "SmartOCR", i18n.get("msg_done"))
 
     def on_batch_stopped(self):
         """Handle user-initiated stop - show restart button and update stuck items"""
+        self._end_item_updates()
         # Force update any items still showing "处理中..." to "用户已终止任务"
-        if hasattr(self, 'current_table') and self.current_table:
-            for row in range(self.current_table.rowCount()):
-                result_item = self.current_table.item(row, 2)
-                if result_item:
-                    current_text = result_item.text()
-                    # Update items that are still showing processing status
-                    if current_text in ["处理中...", "待处理", "Processing...", "Pending"]:
-                        self.current_table.setItem(row, 2, QTableWidgetItem("用户已终止任务"))
+        if hasattr(self, 'current_model') and self.current_model:
+            model = self.current_model
+            for row in range(model.rowCount()):
+                # Update items that are still showing processing status
+                if model.status(row) in _UNFINISHED:
+                    model.set_status(row, "用户已终止任务")
         
         self.btn_start.setText(i18n.get("btn_restart"))
         self.btn_start.setEnabled(True)
@@ -1,5 +1,5 @@
 from PySide6.QtWidgets import QWidget, QLabel, QVBoxLayout, QApplication
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QPoint
 
 class ProgressOverlay(QWidget):
     def __init__(self):
@@ -20,11 +20,35 @@ class ProgressOverlay(QWidget):
             padding: 20px;
         """)
         layout.addWidget(self.label)
-        
-    def show_progress(self):
+
+        # Centered position, recomputed when the primary screen or the
+        # overlay's own size changes
+        self._screen = None
+        self._center_pos = QPoint()
+        QApplication.instance().primaryScreenChanged.connect(self._track_screen)
+        self._track_screen(QApplication.primaryScreen())
+
+    def _track_screen(self, screen):
+        if self._screen is not None:
+            self._screen.geometryChanged.disconnect(self._update_center)
+        self._screen = screen
+        screen.geometryChanged.connect(self._update_center)
+        self._update_center(screen.geometry())
+
+    def _update_center(self, geometry):
         # Center on screen
-        screen = QApplication.primaryScreen().geometry()
-        x = (screen.width() - self.width()) // 2
-        y = (screen.height() - self.height()) // 2
-        self.move(x, y)
+        x = (geometry.width() - self.width()) // 2
+        y = (geometry.height() - self.height()) // 2
+        self._center_pos = QPoint(x, y)
+
+    def resizeEvent(self, event):
+        # Label text/layout changes resize the overlay; keep it centered
+        super().resizeEvent(event)
+        if self._screen is not None:
+            self._update_center(self._screen.geometry())
+            if self.isVisible():
+                self.move(self._center_pos)
+
+    def show_progress(self):
+        self.move(self._center_pos)
         self.show()
@@ -3,11 +3,17 @@ from PySide6.QtWidgets import (
     QPushButton, QToolBar, QLabel, QComboBox, QSplitter
 )
 from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QAction, QIcon
+from PySide6.QtGui import QAction, QIcon, QTextCursor
 from app_config import config
 
 from services.i18n import i18n
 
+# Map nice names to what we pass to prompt
+_LANG_MAP = {
+    "Chinese": "中文", "English": "English", "French": "Francais", 
+    "Russian": "Russian", "German": "Deutsch", "Japanese": "Japanese", "Korean": "Korean"
+}
+
 class ResultWindow(QMainWindow):
     # Updated signal: text, mode, target_lang
     translate_requested = Signal(str, str, str) 
@@ -43,6 +49,7 @@ class ResultWindow(QMainWindow):
 
         # Translation Controls
         self.combo_trans_mode = QComboBox()
+        self._trans_modes = None  # Mode names currently listed in the combo
         self.refresh_trans_modes()
         self.toolbar.addWidget(QLabel(i18n.get("lbl_mode")))
         self.toolbar.addWidget(self.combo_trans_mode)
@@ -50,12 +57,7 @@ class ResultWindow(QMainWindow):
         # Target Lang Selector
         self.toolbar.addWidget(QLabel(i18n.get("lbl_target")))
         self.combo_target_lang = QComboBox()
-        self.combo_target_lang.addItems(["Chinese", "English", "French", "Russian", "German", "Japanese", "Korean"])
-        # Map nice names to what we pass to prompt
-        self.lang_map = {
-            "Chinese": "中文", "English": "English", "French": "Francais", 
-            "Russian": "Russian", "German": "Deutsch", "Japanese": "Japanese", "Korean": "Korean"
-        }
+        self.combo_target_lang.addItems(list(_LANG_MAP))
         self.toolbar.addWidget(self.combo_target_lang)
 
         self.action_translate = QAction(i18n.get("action_translate"), self)
@@ -77,10 +79,14 @@ class ResultWindow(QMainWindow):
         main_layout.addWidget(self.splitter)
         
     def refresh_trans_modes(self):
-        self.combo_trans_mode.clear()
         prompts = config.get("translation", {}).get("custom_prompts", [])
-        for p in prompts:
-            self.combo_trans_mode.addItem(p.get("mode", "Unknown"))
+        modes = tuple(p.get("mode", "Unknown") for p in prompts)
+        # Rebuilding the combo also resets the selection, so only do it on change
+        if modes == self._trans_modes:
+            return
+        self._trans_modes = modes
+        self.combo_trans_mode.clear()
+        self.combo_trans_mode.addItems(list(modes))
 
     def force_show(self):
         self.show()
@@ -96,12 +102,13 @@ class ResultWindow(QMainWindow):
         self.refresh_trans_modes()
 
     def append_debug_info(self, text):
-        # Helper to append error info if needed, or just set text
-        current = self.text_editor.toPlainText()
-        if current:
-            self.text_editor.setPlainText(current + "\n\n" + text)
-        else:
-            self.text_editor.setPlainText(text)
+        # Helper to append error info if needed, or just set text.
+        # Inserted at the end of the document, so existing content is neither
+        # copied out nor re-laid out
+        document = self.text_editor.document()
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text if document.isEmpty() else "\n\n" + text)
 
     def copy_text(self):
         self.text_editor.selectAll()
@@ -126,7 +133,7 @@ class ResultWindow(QMainWindow):
         text = self.text_editor.toPlainText()
         mode = self.combo_trans_mode.currentText()
         target_display = self.combo_target_lang.currentText()
-        target_val = self.lang_map.get(target_display, target_display)
+        target_val = _LANG_MAP.get(target_display, target_display)
         
         if text:
             self.trans_editor.show()
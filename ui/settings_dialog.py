@@ -2,9 +2,9 @@ from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QFormLayout, QLineEdit, QComboBox, 
     QDialogButtonBox, QLabel, QGroupBox, QTabWidget, QWidget,
     QTableWidget, QTableWidgetItem, QPushButton, QHBoxLayout, 
-    QHeaderView, QFileDialog, QCheckBox, QAbstractItemView, QTextEdit
+    QHeaderView, QFileDialog, QCheckBox, QAbstractItemView, QScrollArea
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from app_config import config
 from ui.widgets import HotkeyRecorder
 from services.i18n import i18n
@@ -43,6 +43,14 @@ PaddleOCR-VL：主要给您格式化的语义信息 (Markdown/LaTeX/JSON)。
 """.strip()
 
 
+# Prompt table columns -> custom_prompts fields (text columns, then combo columns)
+PROMPT_TEXT_FIELDS = ("mode", "description", "system_prompt", "prompt")
+PROMPT_FLAG_FIELDS = {4: "enable_thinking", 5: "stream"}
+
+# Delay (ms) used to coalesce a burst of translation-settings edits into one save
+TRANS_SAVE_DELAY_MS = 300
+
+
 class SettingsDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -50,32 +58,50 @@ class SettingsDialog(QDialog):
         # Match main window size (filename column 600 + progress 150 + result 200 + borders 50)
         self.resize(1000, 700) 
         
+        # Translation settings are saved once per editing burst, not per keystroke
+        self._trans_save_timer = QTimer(self)
+        self._trans_save_timer.setSingleShot(True)
+        self._trans_save_timer.setInterval(TRANS_SAVE_DELAY_MS)
+        self._trans_save_timer.timeout.connect(self._do_save_trans)
+
         main_layout = QVBoxLayout(self)
         self.tabs = QTabWidget()
         main_layout.addWidget(self.tabs)
         
+        # Tab pages start empty and are built the first time they are shown
         self.tab_ocr = QWidget()
-        self.init_ocr_tab()
         self.tabs.addTab(self.tab_ocr, i18n.get("tab_ocr_models"))
         
         self.tab_trans = QWidget()
-        self.init_trans_tab()
         self.tabs.addTab(self.tab_trans, i18n.get("tab_ai_trans"))
         
         self.tab_gen = QWidget()
-        self.init_gen_tab()
         self.tabs.addTab(self.tab_gen, i18n.get("tab_general"))
+
+        self._tab_builders = {0: self.init_ocr_tab, 1: self.init_trans_tab, 2: self.init_gen_tab}
+        self.tabs.currentChanged.connect(self._ensure_tab)
+        self._ensure_tab(self.tabs.currentIndex())
         
         buttons = QDialogButtonBox(QDialogButtonBox.Ok)
         buttons.accepted.connect(self.accept)
         main_layout.addWidget(buttons)
 
+    def _ensure_tab(self, index):
+        """Build a tab page's contents on its first selection."""
+        builder = self._tab_builders.pop(index, None)
+        if builder:
+            builder()
+
     def init_ocr_tab(self):
+        # Labels for this tab, fetched in one lookup
+        tr = i18n.bulk_get((
+            "lbl_ocr_config", "lbl_select_model", "lbl_api_url", "lbl_token", "lbl_screenshot_model",
+        ))
         layout = QVBoxLayout(self.tab_ocr)
         layout.setSpacing(6)  # Reduce spacing
         layout.setContentsMargins(10, 10, 10, 10)
         
-        lbl = QLabel(i18n.get("lbl_ocr_config"))
+        lbl = QLabel(tr["lbl_ocr_config"])
         layout.addWidget(lbl)
         
         form = QFormLayout()
@@ -88,34 +114,40 @@ class SettingsDialog(QDialog):
         self.combo_ocr_model.currentTextChanged.connect(self.on_ocr_model_changed)
         
         self.input_ocr_url = QLineEdit()
-        self.input_ocr_url.textChanged.connect(self.save_ocr_config)
+        self.input_ocr_url.editingFinished.connect(self.save_ocr_config)
         
         self.input_ocr_token = QLineEdit()
         self.input_ocr_token.setEchoMode(QLineEdit.Password)
-        self.input_ocr_token.textChanged.connect(self.save_ocr_config)
+        self.input_ocr_token.editingFinished.connect(self.save_ocr_config)
         
         # Screenshot Model Selector
         self.combo_screenshot_model = QComboBox()
         self.combo_screenshot_model.addItems(["PP-OCRv5", "PP-StructureV3", "PaddleOCR-VL"])
-        self.combo_screenshot_model.setCurrentText(config.get("screenshot_model", "PP-OCRv5"))
+        self.combo_screenshot_model.setCurrentText(config.view.screenshot_model)
         self.combo_screenshot_model.currentTextChanged.connect(lambda t: config.set("screenshot_model", t))
         
-        form.addRow(i18n.get("lbl_select_model"), self.combo_ocr_model)
-        form.addRow(i18n.get("lbl_api_url"), self.input_ocr_url)
-        form.addRow(i18n.get("lbl_token"), self.input_ocr_token)
-        form.addRow(i18n.get("lbl_screenshot_model"), self.combo_screenshot_model)
+        form.addRow(tr["lbl_select_model"], self.combo_ocr_model)
+        form.addRow(tr["lbl_api_url"], self.input_ocr_url)
+        form.addRow(tr["lbl_token"], self.input_ocr_token)
+        form.addRow(tr["lbl_screenshot_model"], self.combo_screenshot_model)
         layout.addLayout(form)
         
         self.load_ocr_fields(self.combo_ocr_model.currentText())
         
         # Model description text
         layout.addWidget(QLabel("模型介绍:"))
-        desc_text = QTextEdit()
-        desc_text.setPlainText(MODEL_DESCRIPTION)
-        desc_text.setReadOnly(True)
+        # Static text: a selectable label needs no QTextDocument behind it
+        desc_label = QLabel(MODEL_DESCRIPTION)
+        desc_label.setTextFormat(Qt.PlainText)
+        desc_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        desc_label.setWordWrap(True)
+        desc_label.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+        desc_scroll = QScrollArea()
+        desc_scroll.setWidget(desc_label)
+        desc_scroll.setWidgetResizable(True)
         # Set fixed height to display all content (approximately 30 lines at 15px each)
-        desc_text.setMinimumHeight(450)
-        layout.addWidget(desc_text)
+        desc_scroll.setMinimumHeight(450)
+        layout.addWidget(desc_scroll)
 
     def on_ocr_model_changed(self, model_name):
         config.set("current_model", model_name)
@@ -139,33 +171,37 @@ class SettingsDialog(QDialog):
         config.set_model_config(model, url, token)
 
     def init_trans_tab(self):
+        # Labels for this tab, fetched in one lookup
+        tr = i18n.bulk_get((
+            "grp_llm_con", "lbl_api_base", "lbl_api_key", "lbl_model_name", "lbl_trans_modes", "btn_add_mode",
+        ))
         layout = QVBoxLayout(self.tab_trans)
         
-        group_con = QGroupBox(i18n.get("grp_llm_con"))
+        group_con = QGroupBox(tr["grp_llm_con"])
         form = QFormLayout()
         
         trans_cfg = config.get("translation")
         
         self.input_trans_url = QLineEdit(trans_cfg.get("api_url", ""))
-        self.input_trans_url.textChanged.connect(self.save_trans_config)
+        self.input_trans_url.editingFinished.connect(self.save_trans_config)
         
         self.input_trans_key = QLineEdit(trans_cfg.get("api_key", ""))
         self.input_trans_key.setEchoMode(QLineEdit.Password)
-        self.input_trans_key.textChanged.connect(self.save_trans_config)
+        self.input_trans_key.editingFinished.connect(self.save_trans_config)
         
         self.input_trans_model = QLineEdit(trans_cfg.get("model", "gpt-3.5-turbo"))
-        self.input_trans_model.textChanged.connect(self.save_trans_config)
+        self.input_trans_model.editingFinished.connect(self.save_trans_config)
         
-        form.addRow(i18n.get("lbl_api_base"), self.input_trans_url)
-        form.addRow(i18n.get("lbl_api_key"), self.input_trans_key)
-        form.addRow(i18n.get("lbl_model_name"), self.input_trans_model)
+        form.addRow(tr["lbl_api_base"], self.input_trans_url)
+        form.addRow(tr["lbl_api_key"], self.input_trans_key)
+        form.addRow(tr["lbl_model_name"], self.input_trans_model)
         group_con.setLayout(form)
         layout.addWidget(group_con)
         
-        lbl = QLabel(i18n.get("lbl_trans_modes"))
+        lbl = QLabel(tr["lbl_trans_modes"])
         layout.addWidget(lbl)
         
-        btn_add_prompt = QPushButton(i18n.get("btn_add_mode"))
+        btn_add_prompt = QPushButton(tr["btn_add_mode"])
         btn_add_prompt.clicked.connect(self.add_empty_prompt_row)
         layout.addWidget(btn_add_prompt)
         
@@ -179,57 +215,63 @@ class SettingsDialog(QDialog):
         
         prompts = trans_cfg.get("custom_prompts", [])
         self.table_prompts.setRowCount(len(prompts))
+        # One prompt dict per table row, kept in sync cell by cell
+        self._prompt_rows = []
         
+        # Fill all rows with painting and signals off, then repaint once
+        self.table_prompts.setUpdatesEnabled(False)
+        self.table_prompts.blockSignals(True)
         for r, p in enumerate(prompts):
             self.fill_prompt_row(r, p)
+        self.table_prompts.blockSignals(False)
+        self.table_prompts.setUpdatesEnabled(True)
             
-        self.table_prompts.cellChanged.connect(self.save_trans_config)
+        self.table_prompts.cellChanged.connect(self.on_prompt_cell_changed)
         layout.addWidget(self.table_prompts)
 
     def fill_prompt_row(self, r, p):
-        self.table_prompts.setItem(r, 0, QTableWidgetItem(p.get("mode", "")))
-        self.table_prompts.setItem(r, 1, QTableWidgetItem(p.get("description", "")))
-        self.table_prompts.setItem(r, 2, QTableWidgetItem(p.get("system_prompt", "")))
-        self.table_prompts.setItem(r, 3, QTableWidgetItem(p.get("prompt", "")))
-        
-        self.set_combo_cell(r, 4, p.get("enable_thinking", False))
-        self.set_combo_cell(r, 5, p.get("stream", False))
+        # Register the row's data first: setItem below may emit cellChanged
+        row_data = {field: p.get(field, "") for field in PROMPT_TEXT_FIELDS}
+        for field in PROMPT_FLAG_FIELDS.values():
+            row_data[field] = bool(p.get(field, False))
+        self._prompt_rows.append(row_data)
+
+        for col, field in enumerate(PROMPT_TEXT_FIELDS):
+            self.table_prompts.setItem(r, col, QTableWidgetItem(row_data[field]))
+        for col, field in PROMPT_FLAG_FIELDS.items():
+            self.set_combo_cell(r, col, row_data[field])
 
     def set_combo_cell(self, row, col, current_val):
         combo = QComboBox()
         combo.addItems(["否", "是"])
         combo.setCurrentText("是" if current_val else "否")
-        combo.currentTextChanged.connect(self.save_trans_config)
+        combo.currentTextChanged.connect(
+            lambda text, row=row, col=col: self.on_prompt_flag_changed(row, col, text == "是"))
         self.table_prompts.setCellWidget(row, col, combo)
 
+    def on_prompt_cell_changed(self, row, col):
+        """Copy just the edited cell into the row data, then schedule a save."""
+        if col < len(PROMPT_TEXT_FIELDS):
+            self._prompt_rows[row][PROMPT_TEXT_FIELDS[col]] = self.table_prompts.item(row, col).text()
+            self.save_trans_config()
+
+    def on_prompt_flag_changed(self, row, col, value):
+        self._prompt_rows[row][PROMPT_FLAG_FIELDS[col]] = value
+        self.save_trans_config()
+
     def add_empty_prompt_row(self):
         r = self.table_prompts.rowCount()
         self.table_prompts.insertRow(r)
         self.fill_prompt_row(r, {})
 
     def save_trans_config(self):
-        prompts = []
-        for r in range(self.table_prompts.rowCount()):
-            mode = self.table_prompts.item(r, 0).text() if self.table_prompts.item(r, 0) else ""
-            desc = self.table_prompts.item(r, 1).text() if self.table_prompts.item(r, 1) else ""
-            sys_p = self.table_prompts.item(r, 2).text() if self.table_prompts.item(r, 2) else ""
-            usr_p = self.table_prompts.item(r, 3).text() if self.table_prompts.item(r, 3) else ""
-            
-            combo_think = self.table_prompts.cellWidget(r, 4)
-            think_val = combo_think.currentText() == "是" if combo_think else False
-            
-            combo_stream = self.table_prompts.cellWidget(r, 5)
-            stream_val = combo_stream.currentText() == "是" if combo_stream else False
-            
-            if mode:
-                prompts.append({
-                    "mode": mode,
-                    "description": desc,
-                    "system_prompt": sys_p,
-                    "prompt": usr_p,
-                    "enable_thinking": think_val,
-                    "stream": stream_val
-                })
+        """Schedule a save of the translation settings (restarts the delay)."""
+        self._trans_save_timer.start()
+
+    def _do_save_trans(self):
+        # Fresh dicts: config consumers cache by object identity, and the
+        # row data keeps changing as the user edits
+        prompts = [dict(row) for row in self._prompt_rows if row["mode"]]
         
         trans_config = {
             "api_url": self.input_trans_url.text(),
@@ -240,6 +282,10 @@ class SettingsDialog(QDialog):
         config.set("translation", trans_config)
 
     def init_gen_tab(self):
+        # Labels for this tab, fetched in one lookup
+        tr = i18n.bulk_get((
+            "lbl_lang", "lbl_minimize_tray", "lbl_hk_capture", "lbl_hk_trans", "lbl_hk_show_main",
+        ))
         layout = QVBoxLayout(self.tab_gen)
         form = QFormLayout()
         
@@ -248,7 +294,7 @@ class SettingsDialog(QDialog):
         self.combo_lang.addItems(["简体中文 (zh_CN)", "English (en_US)"])
         self.lang_map = {"简体中文 (zh_CN)": "zh_CN", "English (en_US)": "en_US"}
         
-        current_lang = config.get("language", "zh_CN")
+        current_lang = config.view.language
         for k, v in self.lang_map.items():
             if v == current_lang:
                 self.combo_lang.setCurrentText(k)
@@ -257,27 +303,27 @@ class SettingsDialog(QDialog):
 
         # Minimize to Tray
         self.chk_tray = QCheckBox()
-        self.chk_tray.setChecked(config.get("minimize_to_tray", False))
+        self.chk_tray.setChecked(config.view.minimize_to_tray)
         self.chk_tray.toggled.connect(lambda v: config.set("minimize_to_tray", v))
 
         # Hotkeys - set type so they know which hotkey to update
         self.hk_capture = HotkeyRecorder()
         self.hk_capture.hotkey_type = "screenshot"
-        self.hk_capture.setText(config.get("hotkey_cature") or "F4")
+        self.hk_capture.setText(config.view.hotkey_capture)
         
         self.hk_trans = HotkeyRecorder()
         self.hk_trans.hotkey_type = "translate"
-        self.hk_trans.setText(config.get("hotkey_trans_capture") or "F6")
+        self.hk_trans.setText(config.view.hotkey_translate)
         
         self.hk_show_main = HotkeyRecorder()
         self.hk_show_main.hotkey_type = "show_main"
-        self.hk_show_main.setText(config.get("hotkey_show_main") or "F9")
+        self.hk_show_main.setText(config.view.hotkey_show_main)
         
-        form.addRow(i18n.get("lbl_lang"), self.combo_lang)
-        form.addRow(i18n.get("lbl_minimize_tray"), self.chk_tray)
-        form.addRow(i18n.get("lbl_hk_capture"), self.hk_capture)
-        form.addRow(i18n.get("lbl_hk_trans"), self.hk_trans)
-        form.addRow(i18n.get("lbl_hk_show_main"), self.hk_show_main)
+        form.addRow(tr["lbl_lang"], self.combo_lang)
+        form.addRow(tr["lbl_minimize_tray"], self.chk_tray)
+        form.addRow(tr["lbl_hk_capture"], self.hk_capture)
+        form.addRow(tr["lbl_hk_trans"], self.hk_trans)
+        form.addRow(tr["lbl_hk_show_main"], self.hk_show_main)
         
         layout.addLayout(form)
         layout.addStretch()
@@ -286,5 +332,17 @@ class SettingsDialog(QDialog):
         val = self.lang_map.get(text, "zh_CN")
         config.set("language", val)
 
+    def done(self, result):
+        # Text fields save on editingFinished: take focus off the field being
+        # edited now, so its save is queued before the flush below
+        focused = self.focusWidget()
+        if focused:
+            focused.clearFocus()
+        # Persist an edit still waiting in the debounce delay
+        if self._trans_save_timer.isActive():
+            self._trans_save_timer.stop()
+            self._do_save_trans()
+        super().done(result)
+
     def accept(self):
         super().accept()
@@ -1,8 +1,16 @@
 from PySide6.QtWidgets import QWidget, QApplication, QRubberBand
-from PySide6.QtCore import Qt, QRect, Signal, QPoint
-from PySide6.QtGui import QPainter, QColor, QPen, QPixmap, QFont, QBrush
+from PySide6.QtCore import Qt, QRect, QRectF, Signal, QPoint, QTimer
+from PySide6.QtGui import QPainter, QColor, QPen, QPixmap, QFont, QFontMetrics, QBrush
 import sys
 
+# Minimum interval (ms) between repaints while dragging (~one 60 Hz frame)
+DRAG_REPAINT_MS = 16
+
+def _source_rect(rect, pixmap):
+    """Map a widget-coordinate rect to the pixmap's device pixels (HiDPI grabs)."""
+    dpr = pixmap.devicePixelRatio()
+    return QRectF(rect.x() * dpr, rect.y() * dpr, rect.width() * dpr, rect.height() * dpr)
+
 class SnippingTool(QWidget):
     capture_done = Signal(object) # Emits QPixmap or None
 
@@ -18,13 +26,44 @@ class SnippingTool(QWidget):
         self.end_point = QPoint()
         self.is_snipping = False
         self.original_pixmap = None
+        self._dimmed_pixmap = None
+
+        # Fonts and the constant hint's metrics, resolved once instead of per repaint
+        self._hint_text = "按 ESC 键取消截图"
+        self._hint_font = QFont("Microsoft YaHei", 16)
+        self._hint_font.setBold(True)
+        hint_fm = QFontMetrics(self._hint_font)
+        self._hint_width = hint_fm.horizontalAdvance(self._hint_text)
+        self._hint_height = hint_fm.height()
+        self._size_font = QFont("Microsoft YaHei", 10)
+        self._size_fm = QFontMetrics(self._size_font)
+
+        # Coalesces drag repaints: high-rate mice send far more move events
+        # than the display can show
+        self._paint_timer = QTimer(self)
+        self._paint_timer.setSingleShot(True)
+        self._paint_timer.setInterval(DRAG_REPAINT_MS)
+        self._paint_timer.timeout.connect(self._repaint_selection)
+        self._prev_area = QRect()
 
     def start_capture(self):
+        # Already capturing (e.g. the hotkey was pressed again): keep the
+        # current grab rather than reading back the framebuffer once more
+        if self.isVisible():
+            self.activateWindow()
+            return
+
         # 1. Grab screen BEFORE showing this window
         screen = QApplication.primaryScreen()
         if screen:
              # Grab the whole virtual desktop if possible, but for now primary screen
             self.original_pixmap = screen.grabWindow(0)
+            # Compose the dimmed background once per grab; repaints then
+            # blit it instead of drawing the screen and the dim overlay again
+            self._dimmed_pixmap = QPixmap(self.original_pixmap)
+            dim_painter = QPainter(self._dimmed_pixmap)
+            dim_painter.fillRect(self._dimmed_pixmap.rect(), QColor(0, 0, 0, 100))
+            dim_painter.end()
         
         # 2. Set geometry to match screen
         self.setGeometry(screen.geometry())
@@ -33,21 +72,66 @@ class SnippingTool(QWidget):
         self.show()
         self.activateWindow()
 
+    def _hint_layout(self, rect):
+        """Place the ESC hint and size label around a selection.
+
+        Returns (hint_pos, hint_bg, size_text, size_pos, size_bg).
+        """
+        text_width = self._hint_width
+        text_height = self._hint_height
+
+        # Center above the selection box
+        text_x = rect.left() + (rect.width() - text_width) // 2
+        text_y = rect.top() - 10  # 10px above selection
+
+        # Make sure it's on screen
+        if text_y < text_height + 10:
+            text_y = rect.bottom() + text_height + 10  # Below if no room above
+        if text_x < 10:
+            text_x = 10
+        if text_x + text_width > self.width() - 10:
+            text_x = self.width() - text_width - 10
+        hint_bg = QRect(text_x - 8, text_y - text_height - 2, text_width + 16, text_height + 8)
+
+        size_text = f"{rect.width()} × {rect.height()}"
+        size_x = rect.left() + 5
+        size_y = rect.bottom() + 20 if rect.bottom() + 25 < self.height() else rect.top() - 5
+        size_width = self._size_fm.horizontalAdvance(size_text)
+        size_bg = QRect(size_x - 4, size_y - 14, size_width + 8, 18)
+        return QPoint(text_x, text_y), hint_bg, size_text, QPoint(size_x, size_y), size_bg
+
+    def _selection_area(self):
+        """Screen area painted for the current selection (border and labels included)."""
+        if self.start_point == self.end_point:
+            return QRect()
+        rect = QRect(self.start_point, self.end_point).normalized()
+        _, hint_bg, _, _, size_bg = self._hint_layout(rect)
+        # Pad by the border pen's width
+        return rect.adjusted(-2, -2, 2, 2).united(hint_bg).united(size_bg)
+
+    def _repaint_selection(self):
+        """Repaint only where the previous or current selection is drawn."""
+        area = self._selection_area()
+        self.update(self._prev_area.united(area))
+        self._prev_area = area
+
     def paintEvent(self, event):
         if self.original_pixmap:
             painter = QPainter(self)
-            # Draw the real screen background
-            painter.drawPixmap(0, 0, self.original_pixmap)
-            
-            # Draw dimming overlay (black with alpha)
-            painter.fillRect(self.rect(), QColor(0, 0, 0, 100))
+            # Only the exposed part is redrawn; while dragging that is the
+            # old and new selection, not the whole screen
+            dirty = event.rect()
+            painter.setClipRect(dirty)
+            # Draw the pre-dimmed screen background
+            painter.drawPixmap(QRectF(dirty), self._dimmed_pixmap, _source_rect(dirty, self._dimmed_pixmap))
             
             # If snipping, clear the dimming rect to show original screen "brightly"
             if self.start_point != self.end_point:
                 rect = QRect(self.start_point, self.end_point).normalized()
+                hint_pos, hint_bg, size_text, size_pos, size_bg = self._hint_layout(rect)
                 
                 # Draw the original pixmap inside the rect again (to "undim" it)
-                painter.drawPixmap(rect, self.original_pixmap, rect)
+                painter.drawPixmap(QRectF(rect), self.original_pixmap, _source_rect(rect, self.original_pixmap))
                 
                 # Draw border
                 pen = QPen(QColor(0, 120, 215), 2)
@@ -55,77 +139,56 @@ class SnippingTool(QWidget):
                 painter.drawRect(rect)
                 
                 # Draw ESC hint ABOVE selection box with highlight background
-                hint_text = "按 ESC 键取消截图"
-                font = QFont("Microsoft YaHei", 16)
-                font.setBold(True)
-                painter.setFont(font)
-                
-                # Calculate text position (above selection)
-                text_width = painter.fontMetrics().horizontalAdvance(hint_text)
-                text_height = painter.fontMetrics().height()
-                
-                # Center above the selection box
-                text_x = rect.left() + (rect.width() - text_width) // 2
-                text_y = rect.top() - 10  # 10px above selection
-                
-                # Make sure it's on screen
-                if text_y < text_height + 10:
-                    text_y = rect.bottom() + text_height + 10  # Below if no room above
-                if text_x < 10:
-                    text_x = 10
-                if text_x + text_width > self.width() - 10:
-                    text_x = self.width() - text_width - 10
-                
-                # Draw background for hint
-                bg_rect = QRect(text_x - 8, text_y - text_height - 2, text_width + 16, text_height + 8)
-                painter.fillRect(bg_rect, QColor(0, 120, 215, 200))
+                painter.setFont(self._hint_font)
+                painter.fillRect(hint_bg, QColor(0, 120, 215, 200))
                 
                 # Draw text in white on blue background
                 painter.setPen(QPen(QColor(255, 255, 255)))
-                painter.drawText(text_x, text_y, hint_text)
+                painter.drawText(hint_pos, self._hint_text)
                 
                 # Draw selection size hint
-                width = rect.width()
-                height = rect.height()
-                size_text = f"{width} × {height}"
-                font = QFont("Microsoft YaHei", 10)
-                painter.setFont(font)
-                painter.setPen(QPen(QColor(255, 255, 255)))
-                
-                size_x = rect.left() + 5
-                size_y = rect.bottom() + 20 if rect.bottom() + 25 < self.height() else rect.top() - 5
-                
-                # Background for size hint
-                size_width = painter.fontMetrics().horizontalAdvance(size_text)
-                size_bg = QRect(size_x - 4, size_y - 14, size_width + 8, 18)
+                painter.setFont(self._size_font)
                 painter.fillRect(size_bg, QColor(0, 0, 0, 150))
-                painter.drawText(size_x, size_y, size_text)
+                painter.drawText(size_pos, size_text)
 
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             self.start_point = event.pos()
             self.end_point = event.pos()
             self.is_snipping = True
+            self._prev_area = QRect()
             self.update()
 
     def mouseMoveEvent(self, event):
         if self.is_snipping:
             self.end_point = event.pos()
-            self.update()
+            if not self._paint_timer.isActive():
+                self._paint_timer.start()
 
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.LeftButton:
             self.is_snipping = False
+            self._paint_timer.stop()
             rect = QRect(self.start_point, self.end_point).normalized()
+            pixmap = self.original_pixmap  # Released when the overlay hides
             
             self.close() # Close immediately
             
             if rect.width() > 10 and rect.height() > 10:
-                captured_pixmap = self.original_pixmap.copy(rect)
-                self.capture_done.emit(captured_pixmap)
+                # Crop on the next event-loop pass so the overlay is taken
+                # down before the copy. QPixmap is GUI-thread only, so the
+                # copy cannot move to a worker thread.
+                QTimer.singleShot(0, lambda: self.capture_done.emit(pixmap.copy(rect)))
             else:
                 self.capture_done.emit(None)
 
+    def hideEvent(self, event):
+        # The full-screen grab and its dimmed copy are only needed while the
+        # overlay is up; a pending crop holds its own reference
+        self.original_pixmap = None
+        self._dimmed_pixmap = None
+        super().hideEvent(event)
+
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_Escape:
             self.capture_done.emit(None)
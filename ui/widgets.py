@@ -1,6 +1,22 @@
+import logging
 from PySide6.QtWidgets import QLineEdit, QMessageBox
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QKeyEvent, QKeySequence
+from app_config import config
+
+try:
+    from services.hotkey_manager import hotkey_manager
+except ImportError:  # e.g. the keyboard package is unavailable
+    hotkey_manager = None
+
+logger = logging.getLogger(__name__)
+
+# hotkey_type -> (config key, log label)
+_HOTKEY_TARGETS = {
+    "screenshot": ("hotkey_cature", "Screenshot"),
+    "translate": ("hotkey_trans_capture", "Translate"),
+    "show_main": ("hotkey_show_main", "Show main window"),
+}
 
 class HotkeyRecorder(QLineEdit):
     key_sequence_changed = Signal(str)
@@ -52,24 +68,14 @@ class HotkeyRecorder(QLineEdit):
 
     def _apply_hotkey_immediately(self, sequence):
         """Apply the new hotkey immediately without restart."""
-        try:
-            from services.hotkey_manager import hotkey_manager
-            from app_config import config
-            
-            if self.hotkey_type == "screenshot":
-                if hotkey_manager.register_screenshot_hotkey(sequence):
-                    config.set("hotkey_cature", sequence)
-                    print(f"Screenshot hotkey updated to: {sequence}")
-            elif self.hotkey_type == "translate":
-                if hotkey_manager.register_translate_hotkey(sequence):
-                    config.set("hotkey_trans_capture", sequence)
-                    print(f"Translate hotkey updated to: {sequence}")
-            elif self.hotkey_type == "show_main":
-                if hotkey_manager.register_show_main_hotkey(sequence):
-                    config.set("hotkey_show_main", sequence)
-                    print(f"Show main window hotkey updated to: {sequence}")
-        except Exception as e:
-            print(f"Failed to update hotkey: {e}")
+        target = _HOTKEY_TARGETS.get(self.hotkey_type)
+        if target is None or hotkey_manager is None:
+            return
+        config_key, label = target
+        # register() reports its own failures and returns False
+        if hotkey_manager.register(self.hotkey_type, sequence):
+            config.set(config_key, sequence)
+            logger.info("%s hotkey updated to: %s", label, sequence)
 
     def mousePressEvent(self, e):
         self.setFocus()
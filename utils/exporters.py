@@ -1,9 +1,36 @@
 import os
 import csv
 import json
-import pandas as pd
-from docx import Document
-# requirements: pip install python-docx pandas openpyxl reportlab
+from xml.sax.saxutils import escape
+# requirements: pip install python-docx openpyxl reportlab
+# (imported where used, so loading this module stays cheap)
+
+# Write buffer for JSONL output (bytes)
+JSONL_BUFFER_SIZE = 1 << 20
+
+# One batch result in a .docx body: heading, text, page break
+DOCX_RESULT_TEMPLATE = (
+    '<w:p><w:pPr><w:pStyle w:val="Heading1"/></w:pPr>{heading}</w:p>'
+    '<w:p>{text}</w:p>'
+    '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+)
+
+
+def _docx_text_runs(text):
+    """Escape text into a <w:r> run, mapping newlines/tabs like python-docx does."""
+    if not text:
+        return ''
+    parts = []
+    for i, line in enumerate(text.replace('\r\n', '\n').replace('\r', '\n').split('\n')):
+        if i:
+            parts.append('<w:br/>')
+        for j, chunk in enumerate(line.split('\t')):
+            if j:
+                parts.append('<w:tab/>')
+            if chunk:
+                parts.append(f'<w:t xml:space="preserve">{escape(chunk)}</w:t>')
+    return f"<w:r>{''.join(parts)}</w:r>"
+
 
 class Exporter:
     @staticmethod
@@ -13,17 +40,32 @@ class Exporter:
         For batch: list of {'filename':..., 'text':..., 'data':...}
         For single: {'text':...}
         """
-        if format_type == "txt":
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(data.get('text', ''))
-        elif format_type == "jsonl":
-            with open(filepath, 'a', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False)
-                f.write('\n')
-        elif format_type == "md":
+        if format_type == "jsonl":
+            with Exporter.open_jsonl(filepath) as f:
+                Exporter.write_jsonl(f, data)
+        elif format_type in ("txt", "md"):
+            text = data.get('text', '')
+            # Nothing recognized (e.g. a failed OCR): don't create an empty file
+            if not text:
+                return
+            if format_type == "md":
+                text = f"# OCR Result\n\n{text}"
             with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(f"# OCR Result\n\n{data.get('text', '')}")
+                f.write(text)
         
+    @staticmethod
+    def open_jsonl(filepath):
+        """
+        Open a JSONL file for appending many records through one handle.
+        Use as a context manager; records are buffered and flushed on close.
+        """
+        return open(filepath, 'a', encoding='utf-8', buffering=JSONL_BUFFER_SIZE)
+
+    @staticmethod
+    def write_jsonl(f, data):
+        """Append one record to a file from open_jsonl."""
+        f.write(json.dumps(data, ensure_ascii=False) + '\n')
+
     @staticmethod
     def export_batch(results, output_dir, formats):
         """
@@ -34,20 +76,51 @@ class Exporter:
         
         for fmt in formats:
             if fmt == "xlsx":
-                df = pd.DataFrame(results)
-                df.to_excel(os.path.join(output_dir, "batch_result.xlsx"))
+                # Write-only mode streams rows out instead of building the
+                # whole sheet (or a DataFrame) in memory first
+                from openpyxl import Workbook
+                wb = Workbook(write_only=True)
+                ws = wb.create_sheet()
+                keys = list(results[0].keys()) if results else []
+                ws.append(keys)
+                for res in results:
+                    ws.append([res.get(k, "") for k in keys])
+                wb.save(os.path.join(output_dir, "batch_result.xlsx"))
                 
             elif fmt == "csv":
-                df = pd.DataFrame(results)
-                df.to_csv(os.path.join(output_dir, "batch_result.csv"))
+                keys = list(results[0].keys()) if results else []
+                with open(os.path.join(output_dir, "batch_result.csv"), 'w', encoding='utf-8', newline='') as f:
+                    writer = csv.DictWriter(f, fieldnames=keys, restval="", extrasaction="ignore")
+                    writer.writeheader()
+                    writer.writerows(results)
                 
             elif fmt == "docx":
+                from docx import Document
+                from docx.oxml import parse_xml
+                from docx.oxml.ns import nsdecls
                 doc = Document()
                 doc.add_heading('OCR Batch Results', 0)
-                for res in results:
-                    doc.add_heading(os.path.basename(res['filename']), level=1)
-                    doc.add_paragraph(res['text'])
-                    doc.add_page_break()
+                # Build every result's paragraphs as one XML fragment and
+                # parse it once, instead of a python-docx call per paragraph
+                fragment = parse_xml(
+                    f"<w:body {nsdecls('w')}>"
+                    + "".join(
+                        DOCX_RESULT_TEMPLATE.format(
+                            heading=_docx_text_runs(os.path.basename(res['filename'])),
+                            text=_docx_text_runs(res['text']),
+                        )
+                        for res in results
+                    )
+                    + "</w:body>"
+                )
+                # Keep the section properties as the body's last element
+                body = doc.element.body
+                sect_pr = body.sectPr
+                for el in list(fragment):
+                    if sect_pr is not None:
+                        sect_pr.addprevious(el)
+                    else:
+                        body.append(el)
                 doc.save(os.path.join(output_dir, "batch_result.docx"))
                 
             elif fmt == "md":